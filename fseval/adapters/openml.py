@@ -3,16 +3,17 @@ from typing import List, Tuple
 
 import numpy as np
 import pandas as pd
-from openml.datasets import get_dataset
 
 from fseval.config.adapters import OpenMLDataset
 from fseval.types import AbstractAdapter
+from fseval.utils.import_utils import import_optional
 
 
 @dataclass
 class OpenML(AbstractAdapter, OpenMLDataset):
     def get_data(self) -> Tuple[List, List]:
-        dataset = get_dataset(self.dataset_id)
+        datasets = import_optional("openml.datasets", package="openml")
+        dataset = datasets.get_dataset(self.dataset_id)
         X, y, cat, _ = dataset.get_data(target=self.target_column)
 
         # drop qualitative columns
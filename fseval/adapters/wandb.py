@@ -1,15 +1,15 @@
 from dataclasses import dataclass
 from typing import List, Tuple
 
-import wandb
-
 from fseval.config.adapters import WandbDataset
 from fseval.types import AbstractAdapter
+from fseval.utils.import_utils import import_optional
 
 
 @dataclass
 class Wandb(AbstractAdapter, WandbDataset):
     def get_data(self) -> Tuple[List, List]:
+        wandb = import_optional("wandb")
         api = wandb.Api()
         artifact = api.artifact(self.artifact_id)
         X = artifact.get("X").data
@@ -21,6 +21,7 @@ class BaseExportCallback(Callback):
             "dataset/task": config.dataset.task.name,  # `.name` because Enum
             "dataset/group": config.dataset.group,
             "dataset/domain": config.dataset.domain,
+            "dataset/fingerprint": config.dataset.fingerprint,
             "ranker": config.ranker.name,
             "validator": config.validator.name,
             "local_dir": os.getcwd(),
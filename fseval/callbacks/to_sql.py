@@ -4,10 +4,10 @@ from typing import Dict
 
 import pandas as pd
 from omegaconf import MISSING, DictConfig
-from sqlalchemy import create_engine
 
 from fseval.config.callbacks.to_sql import ToSQLCallback
 from fseval.types import TerminalColor
+from fseval.utils.import_utils import import_optional
 
 from ._base_export_callback import BaseExportCallback
 
@@ -32,13 +32,17 @@ class SQLCallback(BaseExportCallback, ToSQLCallback):
         )
         assert isinstance(self.kwargs, Dict)
 
+        # import SQLAlchemy only when the callback is used: it is slow to import.
+        import_optional("sqlalchemy")
+
         # log - tell user callback is enabled
         self.logger: Logger = getLogger(__name__)
         self.logger.info("SQL callback enabled.")
 
     def on_begin(self, config: DictConfig):
         # create SQL engine
-        self.engine = create_engine(self.url, **self.kwargs)
+        sqlalchemy = import_optional("sqlalchemy")
+        self.engine = sqlalchemy.create_engine(self.url, **self.kwargs)
 
         # upload experiment config to SQL database
         df = self.get_experiment_config(config)
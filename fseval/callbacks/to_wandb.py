@@ -6,17 +6,20 @@ from logging import Logger, getLogger
 from typing import Dict, Optional, cast
 
 import pandas as pd
-import wandb
 from omegaconf import DictConfig, OmegaConf
 
 from fseval.config.callbacks.to_wandb import ToWandbCallback
 from fseval.types import Callback
 from fseval.utils.dict_utils import dict_flatten, dict_merge
+from fseval.utils.import_utils import import_optional
 
 
 @dataclass
 class WandbCallback(Callback, ToWandbCallback):
     def __post_init__(self):
+        # import wandb only when the callback is used: it is slow to import.
+        import_optional("wandb")
+
         if not self.log_metrics:
             logger: Logger = getLogger(__name__)
             logger.warning(
@@ -42,6 +45,7 @@ class WandbCallback(Callback, ToWandbCallback):
         init_kwargs = copy.deepcopy(self.wandb_init_kwargs)
         dict_merge(init_kwargs, {"config": prepared_cfg})
 
+        wandb = import_optional("wandb")
         try:
             wandb.init(**init_kwargs)
         except TypeError as e:
@@ -53,12 +57,14 @@ class WandbCallback(Callback, ToWandbCallback):
 
     def on_config_update(self, config: Dict):
         prepared_cfg = self._prepare_cfg(config)
+        wandb = import_optional("wandb")
         wandb.config.update(prepared_cfg, allow_val_change=True)
 
     def on_metrics(self, metrics: Dict):
         if not self.log_metrics:
             return
         elif isinstance(metrics, Dict):
+            wandb = import_optional("wandb")
             wandb.log(metrics)
 
             # take wandb rate limiting into account: sleep to prevent getting limited
@@ -67,13 +73,16 @@ class WandbCallback(Callback, ToWandbCallback):
             raise ValueError(f"Incorrect metric type passed: {type(metrics)}")
 
     def on_table(self, df: pd.DataFrame, name: str):
+        wandb = import_optional("wandb")
         table = wandb.Table(dataframe=df)
         logs = {}
         logs[name] = table
         wandb.log(logs)
 
     def on_summary(self, summary: Dict):
+        wandb = import_optional("wandb")
         wandb.summary.update(summary)
 
     def on_end(self, exit_code: Optional[int] = None):
+        wandb = import_optional("wandb")
         wandb.finish(exit_code=exit_code)
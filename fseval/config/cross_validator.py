@@ -1,7 +1,7 @@
 from dataclasses import dataclass
-from typing import Any
+from typing import Any, Optional
 
-from omegaconf import MISSING
+from omegaconf import II, MISSING
 
 
 @dataclass
@@ -23,11 +23,23 @@ class CrossValidatorConfig:
         fold (int): The fold to use in this specific run of the pipeline. e.g. you
             can use `python my_benchmark.py --multirun cv=kfold cv.splitter.n_spits=5 cv.fold=range(0,5)`
             to run a complete 5-fold CV scheme.
+        all_folds (bool): Whether to run all folds in a single run of the pipeline,
+            instead of only `fold`. The dataset is then loaded only once, and the folds
+            run one after another. Exported tables get a `fold` column.
+        cache_dir (Optional[str]): Directory to cache the splits in, keyed by the
+            splitter config and the dataset fingerprint. All splits are then computed
+            once, and the runs of the other folds only load their own split. Splitters
+            that shuffle without a fixed `random_state` are not cached. Disabled if not
+            set.
     """
 
     name: str = MISSING
     splitter: Any = None
     fold: int = 0
+    all_folds: bool = False
+    cache_dir: Optional[str] = None
+    # runtime properties. do not override these.
+    dataset_fingerprint: Optional[str] = II("oc.select:dataset.fingerprint,null")
 
     # required for instantiation
     _target_: str = "fseval.pipeline.cv.CrossValidator"
@@ -1,5 +1,5 @@
 from dataclasses import dataclass
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
 from omegaconf import MISSING
 
@@ -17,7 +17,11 @@ class DatasetConfig:
         task (Task): Either Task.classification or Task.regression.
         adapter: Dataset adapter. must be of fseval.types.AbstractAdapter type,
             i.e. must implement a get_data() -> (X, y) method. Can also be a callable;
-            then the callable must return a tuple (X, y).
+            then the callable must return a tuple (X, y). X can be a scipy sparse
+            matrix, which is then kept sparse throughout the pipeline. For datasets that
+            do not fit in memory, the adapter can be a
+            fseval.types.AbstractChunkedAdapter instead, streaming the data in row
+            chunks. Estimators are then fit chunk by chunk, using `partial_fit`.
         adapter_callable: Adapter class callable. the function to be called on the
             instantiated class to fetch the data (X, y). is ignored when the target
             itself is a function callable.
@@ -32,6 +36,20 @@ class DatasetConfig:
         group (Optional[str]): An optional group attribute, such to group datasets in
             the analytics stage.
         domain (Optional[str]): Dataset domain, e.g. medicine, finance, etc.
+        cache_dir (Optional[str]): Directory to cache the loaded dataset in, as `.npy`
+            files. The cache is keyed by a hash of the adapter config, so runs using the
+            same adapter - e.g. all jobs in a sweep - only call the adapter once. Only
+            applies to adapters configured using a `_target_`. Disabled if not set.
+        memmap (bool): Whether to keep the data matrix on disk, for datasets larger than
+            memory. The pipeline then gets lazy, index-based views of the data: CV
+            splits, resamples and feature subsets do not copy it. Data is only read once
+            an estimator needs a dense array. Requires the adapter to return an
+            `np.memmap`, or a `cache_dir` to be set.
+        fingerprint_blocks (Optional[int]): Amount of 1 MiB blocks of the data to hash
+            when fingerprinting the dataset, sampled evenly across the data. Speeds up
+            fingerprinting very large datasets. Hashes all data if not set. The
+            dataset is only fingerprinted when the fingerprint is used: to key cached
+            CV splits or resamples, or to be exported by a callback.
     """
 
     name: str = MISSING
@@ -42,10 +60,16 @@ class DatasetConfig:
     # optional tags
     group: Optional[str] = None
     domain: Optional[str] = None
+    cache_dir: Optional[str] = None
+    memmap: bool = False
+    fingerprint_blocks: Optional[int] = None
     # runtime properties: will be set once dataset is loaded, no need to configure them.
     n: Optional[int] = None
     p: Optional[int] = None
     multioutput: Optional[bool] = None
+    chunked: bool = False
+    fingerprint: Optional[str] = None
+    classes: Optional[List] = None
 
     # required for instantiation
     _target_: str = "fseval.pipeline.dataset.DatasetLoader"
@@ -1,5 +1,5 @@
 from dataclasses import dataclass
-from typing import Any, Optional
+from typing import Any, List, Optional
 
 from omegaconf import II, MISSING
 
@@ -69,6 +69,8 @@ class EstimatorConfig:
     # runtime properties. do not override these.
     task: Task = II("dataset.task")
     is_multioutput_dataset: bool = II("dataset.multioutput")
+    is_chunked_dataset: bool = II("oc.select:dataset.chunked,false")
+    dataset_classes: Optional[List] = II("oc.select:dataset.classes,null")
 
     # required for instantiation
     _target_: str = "fseval.pipeline.estimator.Estimator"
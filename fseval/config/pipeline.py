@@ -33,16 +33,80 @@ class PipelineConfig:
             the pipeline again but with a resampled (see `resample`) version of the
             dataset. This allows estimating stability, for example.
         n_jobs (Optional[int]): Amount of CPU's to use for computing each bootstrap.
-            This thus distributes the amount of bootstraps over CPU's.
+            This thus distributes the amount of bootstraps over CPU's. When the ranker
+            or validator also sets `n_jobs` (or `n_threads`, `nthread`,
+            `thread_count`), the CPU's are split between both, to avoid
+            oversubscription.
+        backend (str): The parallelization backend used to distribute the bootstraps
+            when `n_jobs` is set. One of `multiprocessing`, `loky`, `threading`,
+            `sequential`, `dask` or `ray`; see joblib. Inside each worker, BLAS and OpenMP thread pools
+            are capped to `cpu_count / n_jobs` threads, to avoid oversubscription.
+            `threading` shares one in-memory dataset between all workers, which is
+            useful for estimators that release the GIL (e.g. LightGBM, XGBoost).
+            `dask` and `ray` ship the bootstraps to a cluster; see `cluster_address`.
+        cluster_address (Optional[str]): Address of the cluster to use with the `dask`
+            or `ray` backend, e.g. `tcp://scheduler:8786`. If not set, an existing
+            client or cluster is used, or otherwise a local cluster is started. The
+            dataset is put in the cluster object store only once; each task runs an
+            entire bootstrap. `n_jobs` bounds the tasks in flight to `2 * n_jobs`.
+        scheduler (str): How to schedule the bootstraps over the workers, when `n_jobs`
+            is set. Either `static`, dispatching the bootstraps in order, or
+            `cost_aware`. The latter estimates the cost of each bootstrap from the size
+            of the data its estimators are fit on and the historical fit times of
+            cached estimators. The most expensive bootstraps are dispatched first, one
+            at a time, to whichever worker is idle. The makespan is logged. When
+            streaming, bootstraps are constructed on-the-fly and all cost the same, so
+            they are scheduled statically.
         all_features_to_select (str): Once the ranker has been fit, this determines
             the feature subsets to validate. By default, at most 50 subsets containing
             the highest ranked features are validated. The format of this parameter is
-            a string that can contain an arbitrary Python expression. The condition is
-            that the expression must evaluate to a `List[int]` object. For example, the
-            default is: `range(1, min(50, p) + 1)`. Each number in the list is passed
-            to the `sklearn.feature_selection.SelectFromModel` as the `max_features`
-            parameter. To see how the expression is evaluated, check out the
-            `fseval.pipelines.rank_and_validate._dataset_validator` module.
+            a string containing a Python expression, that must evaluate to a list of
+            integers. For example, the default is: `range(1, min(50, p) + 1)`. The
+            expression can use `n` and `p`, arithmetic, comprehensions and the functions
+            `range`, `min`, `max`, `int`, `round`, `linspace` and `geomspace`, among
+            others. e.g. `geomspace(1, p, 20)` or `[int(f * p) for f in (0.1, 0.5, 1)]`.
+            Each number in the list is passed to the
+            `sklearn.feature_selection.SelectFromModel` as the `max_features`
+            parameter. The expression is evaluated in a sandbox, only once per dataset:
+            see the `fseval.utils.expression_utils` module.
+        streaming (bool): Whether to run the bootstraps in a streaming fashion. Instead
+            of constructing all bootstrap experiments up front and running `fit` and
+            `score` as separate sweeps, each bootstrap is constructed, fitted, scored
+            and released before the next one is started. Only the scores are kept in
+            memory. In combination with `n_jobs`, each worker fits and scores an entire
+            bootstrap and only sends back its scores: no fitted estimators are sent
+            back to the main process.
+        memory_lean (bool): Whether to score each feature subset right after it was
+            fit. The fitted validation estimator is then released, keeping only its
+            cached version in `storage`. Bounds the peak memory usage by one feature
+            subset per worker. Implies `streaming`.
+        offload_fitted (bool): Whether worker processes should offload their fitted
+            estimators to disk, sending back only lightweight handles to the main
+            process - instead of pickling the fitted estimators back. Estimators are
+            then loaded lazily, only whilst they are saved or scored, and released
+            again afterwards. Only applies when running the bootstraps in parallel
+            using `n_jobs`, without `streaming`.
+        checkpoint (bool): Whether to checkpoint the scores of every validated feature
+            subset, per bootstrap, to storage. When rerunning a crashed or interrupted
+            run, with its save directory as `storage.load_dir`, subsets that were
+            already scored are restored from their checkpoint: they are neither fit
+            nor scored again. Each subset is scored right after it was fit, such that
+            its checkpoint is saved right away. Implies `streaming`.
+        early_stopping (bool): Whether to stop validating feature subsets once the
+            validation score plateaus. Subsets are validated in the order of
+            `all_features_to_select`; each subset is scored right after it was fit.
+            Once `early_stopping_patience` subsets in a row did not improve the best
+            score by more than `early_stopping_tol`, the remaining subsets are skipped.
+            The amount of fits saved is logged.
+        early_stopping_tol (float): Minimum score improvement that resets the patience.
+        early_stopping_patience (int): Amount of subsets in a row without improvement
+            after which to stop.
+        bootstrap_ci_width (Optional[float]): Enables an adaptive amount of bootstraps.
+            Bootstraps are run in rounds, until the 95% confidence interval of the mean
+            validation score is narrower than this width, for every feature subset.
+            `n_bootstraps` is then the maximum budget. Each round runs as many
+            bootstraps as there are parallel workers, i.e. `n_jobs`. At least two
+            bootstraps are run. Fits and scores the bootstraps in a streaming fashion.
         defaults (List[Any]): Default values for the above.
     """
 
@@ -56,7 +120,18 @@ class PipelineConfig:
     metrics: Dict[str, Any] = field(default_factory=lambda: {})
     n_bootstraps: int = 1
     n_jobs: Optional[int] = 1
+    backend: str = "multiprocessing"
+    cluster_address: Optional[str] = None
+    scheduler: str = "static"
     all_features_to_select: str = "range(1, min(50, p) + 1)"
+    streaming: bool = False
+    memory_lean: bool = False
+    offload_fitted: bool = False
+    checkpoint: bool = False
+    early_stopping: bool = False
+    early_stopping_tol: float = 0.01
+    early_stopping_patience: int = 3
+    bootstrap_ci_width: Optional[float] = None
 
     # default values for the above.
     defaults: List[Any] = field(
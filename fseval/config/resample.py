@@ -23,6 +23,11 @@ class ResampleConfig:
             used in the resampling process. In this way, results can be reproduced.
         stratify (Optional[List]): Whether to use stratified resampling. See
             sklearn.utils.resample for more information.
+        cache_dir (Optional[str]): Directory to store resampled datasets in, keyed by
+            the CV split and the `random_state`. Runs with the same dataset, fold and
+            bootstrap, e.g. in a sweep over rankers, then memory-map the same resample
+            instead of each computing their own copy. Only dense datasets are stored.
+            Disabled if not set.
     """
 
     name: str = MISSING
@@ -30,6 +35,7 @@ class ResampleConfig:
     sample_size: Any = None  # float [0.0 to 1.0] or int [1 to n_samples]
     random_state: Optional[int] = None
     stratify: Optional[List] = None
+    cache_dir: Optional[str] = None
 
     # required for instantiation
     _target_: str = "fseval.pipeline.resample.Resample"
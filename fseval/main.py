@@ -1,22 +1,94 @@
+import os
 from glob import glob
 from logging import getLogger
 from os import getcwd
 from pathlib import Path
 from traceback import print_exc
-from typing import Dict, Optional, cast
+from typing import Dict, List, Optional, cast
 
+import pandas as pd
 from hydra.core.utils import _save_config
 from hydra.utils import instantiate
-from omegaconf import DictConfig, open_dict
+from omegaconf import DictConfig, OmegaConf, open_dict
 
 from fseval.config import PipelineConfig
 from fseval.pipeline.dataset import Dataset, DatasetLoader
 from fseval.pipelines._callback_collection import CallbackCollection
+from fseval.pipelines._executor import PROCESS_BACKENDS, Executor
 from fseval.types import AbstractPipeline, IncompatibilityError, TerminalColor
+from fseval.utils.hydra_utils import get_sweep_configs
+from fseval.utils.resource_utils import coordinate_n_jobs
+
+
+def _fit_score(
+    cfg: PipelineConfig,
+    pipeline: AbstractPipeline,
+    X_train,
+    X_test,
+    y_train,
+    y_test,
+    dataset: Dataset,
+) -> Dict:
+    """Fits and scores the pipeline on one train/test split."""
+    logger = getLogger(__name__)
+
+    if (
+        cfg.streaming
+        or cfg.memory_lean
+        or cfg.early_stopping
+        or cfg.checkpoint
+        or cfg.bootstrap_ci_width is not None
+    ):
+        logger.info(f"pipeline {TerminalColor.cyan('fit_score')} (streaming)...")
+        scores = pipeline.fit_score(
+            X_train,
+            y_train,
+            X_test,
+            y_test,
+            feature_importances=dataset.feature_importances,
+        )
+    else:
+        logger.info(f"pipeline {TerminalColor.cyan('prefit')}...")
+        pipeline.prefit()
+        logger.info(f"pipeline {TerminalColor.cyan('fit')}...")
+        pipeline.fit(X_train, y_train)
+        logger.info(f"pipeline {TerminalColor.cyan('postfit')}...")
+        pipeline.postfit()
+        logger.info(f"pipeline {TerminalColor.cyan('score')}...")
+        scores = pipeline.score(
+            X_test, y_test, feature_importances=dataset.feature_importances
+        )
+
+    return cast(Dict, scores)
+
+
+def _needs_fingerprint(cfg: PipelineConfig) -> bool:
+    """Whether the dataset fingerprint is used: to key cached CV splits or resamples,
+    or to be exported by a callback. Fingerprinting hashes the data, so is skipped
+    otherwise."""
+    callback_names = [name for name in cfg.callbacks.keys() if name != "_target_"]
+
+    return (
+        cfg.cv.cache_dir is not None
+        or cfg.resample.cache_dir is not None
+        or len(callback_names) > 0
+    )
+
+
+def _aggregate_folds(folds: List[int], fold_scores: List[Dict]) -> Dict:
+    """Concatenates the score tables of all folds, tagged by fold."""
+    tables: Dict[str, List[pd.DataFrame]] = {}
+    for fold, scores in zip(folds, fold_scores):
+        for name, table in scores.items():
+            tables.setdefault(name, []).append(table.assign(fold=fold))
+
+    return {name: pd.concat(tables[name], ignore_index=True) for name in tables}
 
 
 def run_pipeline(
-    cfg: PipelineConfig, raise_incompatibility_errors: bool = False
+    cfg: PipelineConfig,
+    raise_incompatibility_errors: bool = False,
+    dataset: Optional[Dataset] = None,
 ) -> Optional[Dict]:
     """
     Runs the fseval pipeline.
@@ -27,6 +99,9 @@ def run_pipeline(
             incompatible config was passed. Otherwise, the pipeline is exited
             gracefully. That is, no error is raised and the pipeline is stopped with an
             exit(0).
+        dataset (Optional[Dataset]): The dataset, when it was already loaded, e.g. by
+            an earlier run in the same sweep. Must be loaded using `cfg.dataset`. If
+            not given, the dataset is loaded using `cfg.dataset`.
     """
 
     logger = getLogger(__name__)
@@ -40,11 +115,20 @@ def run_pipeline(
 
     # instantiate and load dataset
     dataset_loader: DatasetLoader = instantiate(cfg.dataset)
-    dataset: Dataset = dataset_loader.load()
+    if dataset is None:
+        dataset = dataset_loader.load()
     # set 'runtime' properties. the other pipeline components need them.
     cfg.dataset.n = dataset.n
     cfg.dataset.p = dataset.p
     cfg.dataset.multioutput = dataset.multioutput
+    cfg.dataset.chunked = dataset.chunked
+    if dataset.fingerprint is None and _needs_fingerprint(cfg):
+        dataset.fingerprint = dataset_loader.get_fingerprint(dataset.X, dataset.y)
+    cfg.dataset.fingerprint = dataset.fingerprint
+    cfg.dataset.classes = dataset.classes
+
+    # split CPU's between bootstrap workers and estimator threads
+    coordinate_n_jobs(cfg)
 
     # instantiate pipeline
     logger.info(f"instantiating pipeline...")
@@ -103,24 +187,37 @@ def run_pipeline(
         + f"[{dataset._log_details}]"
     )
     X, y = dataset.X, dataset.y
-    X_train, X_test, y_train, y_test = pipeline.cv.train_test_split(X, y)
+
+    # run the configured fold, or all folds one after another
+    if cfg.cv.all_folds:
+        folds = list(range(pipeline.cv.get_n_splits(X)))
+        logger.info(f"running all {len(folds)} folds in this process...")
+    else:
+        folds = [cfg.cv.fold]
 
     try:
-        logger.info(f"pipeline {TerminalColor.cyan('prefit')}...")
-        pipeline.prefit()
-        logger.info(f"pipeline {TerminalColor.cyan('fit')}...")
-        pipeline.fit(X_train, y_train)
-        logger.info(f"pipeline {TerminalColor.cyan('postfit')}...")
-        pipeline.postfit()
-        logger.info(f"pipeline {TerminalColor.cyan('score')}...")
-        scores = pipeline.score(
-            X_test, y_test, feature_importances=dataset.feature_importances
+        fold_scores = []
+        for fold in folds:
+            if cfg.cv.all_folds:
+                logger.info(f"running fold {TerminalColor.yellow(str(fold))}...")
+                pipeline.cv.fold = fold
+                pipeline.callbacks.set_tags(fold=fold)
+                if fold != folds[0]:
+                    pipeline.reset()
+
+            X_train, X_test, y_train, y_test = pipeline.cv.train_test_split(X, y)
+            fold_scores.append(
+                _fit_score(cfg, pipeline, X_train, X_test, y_train, y_test, dataset)
+            )
+        scores = (
+            _aggregate_folds(folds, fold_scores) if cfg.cv.all_folds else fold_scores[0]
         )
     except Exception as e:
         print_exc()
         logger.error(e)
         logger.info(
-            "error occured during pipeline `prefit`, `fit`, `postfit` or `score` step... "
+            "error occured during pipeline `prefit`, `fit`, `postfit`, `score` or "
+            + "`fit_score` step... "
             + "exiting with a status code 1."
         )
         pipeline.callbacks.on_end(exit_code=1)
@@ -139,3 +236,108 @@ def run_pipeline(
     # return final scores
     scores = cast(Dict, scores)
     return scores
+
+
+# dataset last loaded by the current (worker) process, keyed by its dataset config.
+_DATASETS: Dict[str, Dataset] = {}
+
+
+def _get_dataset_key(cfg: PipelineConfig) -> str:
+    return OmegaConf.to_yaml(cfg.dataset)
+
+
+def _run_sweep_job(
+    cfg: PipelineConfig, job_dir: str, raise_incompatibility_errors: bool
+) -> Optional[Dict]:
+    """Runs one job of a sweep inside its own directory. Jobs are sorted by dataset,
+    so every worker keeps only its last dataset, and reuses it for the next jobs with
+    the same dataset config."""
+    key = _get_dataset_key(cfg)
+    if key not in _DATASETS:
+        _DATASETS.clear()
+        dataset_loader: DatasetLoader = instantiate(cfg.dataset)
+        _DATASETS[key] = dataset_loader.load()
+
+    cwd = getcwd()
+    os.makedirs(job_dir, exist_ok=True)
+    os.chdir(job_dir)
+    try:
+        return run_pipeline(
+            cfg,
+            raise_incompatibility_errors=raise_incompatibility_errors,
+            dataset=_DATASETS[key],
+        )
+    finally:
+        os.chdir(cwd)
+
+
+def run_sweep(
+    config_module: str,
+    config_name: str,
+    overrides: Optional[List[str]] = None,
+    n_jobs: int = 1,
+    backend: str = "loky",
+    sweep_dir: str = "multirun",
+    cache_dir: Optional[str] = None,
+    raise_incompatibility_errors: bool = False,
+) -> List[Optional[Dict]]:
+    """
+    Runs all jobs of a sweep, like Hydra's `--multirun`, but in a pool of long-lived
+    worker processes. All configs are composed up front, so Hydra is initialized only
+    once, and every worker loads each dataset only once.
+
+    Attributes:
+        config_module (str): The Python module containing the config, e.g.
+            `benchmark.conf`.
+        config_name (str): The name of the config to compose, e.g. `my_config`.
+        overrides (Optional[List[str]]): The sweep overrides, e.g.
+            `["ranker=chi2,anova_f_value_classifier", "validator=knn"]`.
+        n_jobs (int): Amount of jobs to run in parallel. -1 means using all CPU's.
+        backend (str): The joblib backend to run the jobs with: `loky`,
+            `multiprocessing` or `sequential`. Jobs change the working directory, so
+            they cannot run in threads.
+        sweep_dir (str): Directory in which every job gets its own subdirectory.
+        cache_dir (Optional[str]): Directory to share data between the jobs in, like
+            a sweep-level data store. When set, the dataset, the CV splits and the
+            bootstrap resamples are cached, see `DatasetConfig.cache_dir`,
+            `CrossValidatorConfig.cache_dir` and `ResampleConfig.cache_dir`. Jobs on
+            the same dataset, fold and bootstrap then reuse the same data, instead of
+            each computing their own copy.
+        raise_incompatibility_errors (bool): Passed to `run_pipeline`.
+    """
+
+    assert backend in ["sequential"] + PROCESS_BACKENDS, (
+        f"unsupported backend `{backend}` for running a sweep: "
+        + f"must be one of: {', '.join(['sequential'] + PROCESS_BACKENDS)}."
+    )
+
+    logger = getLogger(__name__)
+    configs, job_overrides = get_sweep_configs(config_module, config_name, overrides)
+    logger.info(f"composed {len(configs)} jobs for sweep...")
+    if cache_dir is not None:
+        cache_dir = os.path.abspath(os.path.expanduser(cache_dir))
+        logger.info(f"sharing data between jobs using: {TerminalColor.blue(cache_dir)}")
+        for cfg in configs:
+            cfg.dataset.cache_dir = cache_dir
+            cfg.cv.cache_dir = cache_dir
+            cfg.resample.cache_dir = cache_dir
+    for job_num, job in enumerate(job_overrides):
+        logger.info(f"\t#{job_num} : {' '.join(job)}")
+
+    sweep_dir = os.path.abspath(sweep_dir)
+    jobs = [
+        (cfg, os.path.join(sweep_dir, str(job_num)), raise_incompatibility_errors)
+        for job_num, cfg in enumerate(configs)
+    ]
+
+    # jobs on the same dataset run next to each other
+    order = sorted(range(len(jobs)), key=lambda i: _get_dataset_key(configs[i]))
+    executor = Executor(backend=backend, n_jobs=n_jobs)
+    results = executor.starmap(_run_sweep_job, [jobs[i] for i in order])
+
+    # restore job order
+    ordered_results: List[Optional[Dict]] = [None] * len(jobs)
+    for result, i in zip(results, order):
+        ordered_results[i] = result
+
+    return ordered_results
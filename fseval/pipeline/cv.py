@@ -1,17 +1,42 @@
+import hashlib
+import json
 import logging
+import os
+import tempfile
 from dataclasses import dataclass
-from typing import Any, Generator, List, Tuple
+from itertools import islice
+from typing import Any, Generator, List, Optional, Tuple, Union
 
+import numpy as np
 from omegaconf import MISSING
 
 logger = logging.getLogger(__name__)
 
 
+def _as_slice(index: Any) -> Union[slice, Any]:
+    """Converts a contiguous, ascending index into a slice. Slicing returns a view
+    instead of a copy, e.g. for the folds of a `KFold` splitter without shuffling."""
+    index = np.asarray(index)
+    if (
+        index.ndim == 1
+        and len(index) > 0
+        and np.issubdtype(index.dtype, np.integer)
+        and index[-1] - index[0] == len(index) - 1
+        and (len(index) == 1 or np.all(np.diff(index) == 1))
+    ):
+        return slice(int(index[0]), int(index[-1]) + 1)
+
+    return index
+
+
 @dataclass
 class CrossValidator:
     name: str = MISSING
     splitter: Any = None
     fold: int = 0
+    all_folds: bool = False
+    cache_dir: Optional[str] = None
+    dataset_fingerprint: Optional[str] = None
 
     def _ensure_splitter(self):
         assert self.splitter is not None, "no splitter configured!"
@@ -23,20 +48,126 @@ class CrossValidator:
         self._ensure_splitter()
         return self.splitter.split(X, y, groups)
 
+    def get_n_splits(self, X) -> int:
+        self._ensure_splitter()
+        return self.splitter.get_n_splits(X)
+
+    def _is_deterministic(self) -> bool:
+        """Whether the splitter always produces the same splits for the same data,
+        i.e. whether its splits can be cached."""
+        if not hasattr(self.splitter, "random_state"):
+            return True
+
+        random_state = self.splitter.random_state
+        shuffles = getattr(self.splitter, "shuffle", True)
+
+        return isinstance(random_state, (int, np.integer)) or not shuffles
+
+    def _get_splits_key(self) -> Optional[str]:
+        """Key identifying the splits, by the splitter config and the dataset
+        fingerprint. Is `None` if the splits are not always the same."""
+        if self.dataset_fingerprint is None or not self._is_deterministic():
+            return None
+
+        splitter_params = (
+            self.splitter.get_params() if hasattr(self.splitter, "get_params") else {}
+        )
+        config = {
+            "splitter": type(self.splitter).__qualname__,
+            "params": splitter_params,
+            "dataset_fingerprint": self.dataset_fingerprint,
+        }
+        config_str = json.dumps(config, sort_keys=True, default=str)
+
+        return hashlib.blake2b(config_str.encode(), digest_size=16).hexdigest()
+
+    def get_split_key(self) -> Optional[str]:
+        """Key identifying the split of the current fold, such that data derived from
+        it, like bootstrap resamples, can be shared between runs. Is `None` if the
+        split is not always the same."""
+        splits_key = self._get_splits_key()
+        if splits_key is None:
+            return None
+
+        return f"{splits_key}-fold={self.fold}"
+
+    def _get_cache_filename(self) -> Optional[str]:
+        """Filename of the cached splits. Is `None` if the splits cannot be cached."""
+        if self.cache_dir is None:
+            return None
+
+        cache_key = self._get_splits_key()
+        if cache_key is None:
+            logger.debug(f"{self.name}: splits cannot be cached.")
+            return None
+
+        return os.path.join(
+            os.path.expanduser(self.cache_dir), f"splits-{cache_key}.npz"
+        )
+
+    def _restore_split(self, filename: str) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """Loads only the split of the current fold: `.npz` files are read lazily."""
+        if not os.path.exists(filename):
+            return None
+
+        with np.load(filename) as splits:
+            self.n_splits_ = int(splits["n_splits"])
+            assert self.fold < self.n_splits_, f"no fold {self.fold} in {filename}."
+
+            return splits[f"train_{self.fold}"], splits[f"test_{self.fold}"]
+
+    def _save_splits(self, filename: str, splits: List[Tuple[Any, Any]]):
+        """Saves all splits, such that runs of the other folds can load them. The file
+        is written to a temporary file first, and then moved."""
+        arrays = {"n_splits": np.array(len(splits))}
+        for fold, (train_index, test_index) in enumerate(splits):
+            arrays[f"train_{fold}"] = np.asarray(train_index)
+            arrays[f"test_{fold}"] = np.asarray(test_index)
+
+        os.makedirs(os.path.dirname(filename), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(filename), suffix=".tmp")
+        with os.fdopen(fd, "wb") as file_handle:
+            np.savez(file_handle, **arrays)
+        os.replace(tmp_path, filename)
+
+    def _compute_split(self, X) -> Tuple[Any, Any]:
+        """Computes the split of the current fold. When the splits are cached, all
+        splits are computed once and saved; otherwise, only the splits up to the
+        current fold are generated."""
+        filename = self._get_cache_filename()
+
+        if filename is not None:
+            split = self._restore_split(filename)
+            if split is not None:
+                logger.info(f"{self.name}: restored fold {self.fold} from {filename}")
+                return split
+
+            splits = list(self.split(X))
+            self._save_splits(filename, splits)
+            self.n_splits_ = len(splits)
+            return splits[self.fold]
+
+        self.n_splits_ = self.get_n_splits(X)
+        split = next(islice(self.split(X), self.fold, None), None)
+        assert split is not None, f"no fold {self.fold}: splitter has fewer splits."
+
+        return split
+
     def get_split(self, X) -> Tuple[List, List]:
         self._ensure_splitter()
-        splits = list(self.split(X))
-        train_index, test_index = splits[self.fold]
+        train_index, test_index = self._compute_split(X)
         logger.info(
             f"{self.name}: using {len(train_index)} training samples and "
             + f"{len(test_index)} testing samples "
-            + f"(fold={self.fold}, n_splits={len(splits)})"
+            + f"(fold={self.fold}, n_splits={self.n_splits_})"
         )
         return train_index, test_index
 
     def train_test_split(self, X, y) -> Tuple[List, List, List, List]:
-        """Gets train/test split of current fold."""
+        """Gets train/test split of current fold. Contiguous folds are sliced, so they
+        are views of the data instead of copies."""
         train_index, test_index = self.get_split(X)
+        train_index, test_index = _as_slice(train_index), _as_slice(test_index)
 
         X_train, y_train = X[train_index], y[train_index]
         X_test, y_test = X[test_index], y[test_index]
@@ -1,28 +1,44 @@
+import hashlib
+import json
+import os
 import re
+import tempfile
 from dataclasses import dataclass
 from logging import Logger, getLogger
-from typing import Optional, Tuple, Union
+from time import perf_counter
+from typing import Dict, List, Optional, Tuple, Union, cast
 
 import numpy as np
 from hydra.utils import instantiate
 from omegaconf import OmegaConf
+from scipy import sparse
 
 from fseval.config import DatasetConfig
-from fseval.types import TerminalColor
+from fseval.types import AbstractChunkedAdapter, Task, TerminalColor
+from fseval.utils.array_utils import ChunkedArray, IndexedArray
+from fseval.utils.expression_utils import evaluate_expression
+from fseval.utils.hash_utils import fingerprint
 
 
 @dataclass
 class Dataset:
     name: str
-    X: np.ndarray
+    X: Union[np.ndarray, IndexedArray, ChunkedArray, sparse.csr_matrix]
     y: np.ndarray
     n: int
     p: int
     multioutput: bool
-    feature_importances: Optional[np.ndarray] = None
+    feature_importances: Optional[Union[np.ndarray, sparse.csr_matrix]] = None
+    fingerprint: Optional[str] = None
+    classes: Optional[List] = None
 
     logger: Logger = getLogger(__name__)
 
+    @property
+    def chunked(self) -> bool:
+        """Whether the dataset is streamed in row chunks, see `ChunkedArray`."""
+        return isinstance(self.X, ChunkedArray)
+
     @property
     def _log_details(self):
         details = []
@@ -32,11 +48,28 @@ class Dataset:
         if self.multioutput:
             details.append("multioutput")
 
+        if isinstance(self.X, IndexedArray):
+            details.append("memmap")
+
+        if self.chunked:
+            details.append("chunked")
+
+        if sparse.issparse(self.X):
+            density = self.X.nnz / max(1, self.n * self.p)
+            details.append(f"sparse (density={density:.2%})")
+
         details = [TerminalColor.yellow(detail) for detail in details]
         details_str = ",".join(details)
         return details_str
 
 
+class _IndexRecorder:
+    """Returns any index it is subscripted with."""
+
+    def __getitem__(self, index):
+        return index
+
+
 @dataclass
 class DatasetLoader(DatasetConfig):
     logger: Logger = getLogger(__name__)
@@ -62,6 +95,8 @@ class DatasetLoader(DatasetConfig):
             X, y = data
 
             return X, y
+        elif isinstance(adapter, AbstractChunkedAdapter):
+            return self._get_chunked_data(adapter)
         else:
             funcname = self.adapter_callable
             msg = f"adapter class `{self._target_}` function `{funcname}`"
@@ -80,49 +115,247 @@ class DatasetLoader(DatasetConfig):
 
             return X, y
 
-    def get_feature_importances(
-        self, X: np.ndarray, n: int, p: int
-    ) -> Optional[np.ndarray]:
-        if self.feature_importances is None:
+    def _get_chunked_data(
+        self, adapter: AbstractChunkedAdapter
+    ) -> Tuple[ChunkedArray, np.ndarray]:
+        """Streams the dataset once, to find its shape and to collect the target. The
+        target is kept in memory, but the data matrix never is: see `ChunkedArray`."""
+        n, p = 0, None
+        y_chunks = []
+        for X_chunk, y_chunk in adapter.get_chunks():
+            n += X_chunk.shape[0]
+            p = X_chunk.shape[1]
+            y_chunks.append(np.asarray(y_chunk))
+        assert p is not None, f"chunked adapter `{self._target_}` yielded no chunks."
+
+        return ChunkedArray(adapter.get_chunks, n, p), np.concatenate(y_chunks)
+
+    def _get_cache_key(self) -> Optional[str]:
+        """Hash of the adapter config. Only adapters configured as a dict, i.e. using a
+        `_target_`, can be hashed: other adapters are not cached."""
+        if not (OmegaConf.is_dict(self.adapter) or isinstance(self.adapter, dict)):
             return None
 
+        adapter = (
+            OmegaConf.to_container(self.adapter, resolve=True)
+            if OmegaConf.is_dict(self.adapter)
+            else self.adapter
+        )
+        config = {"adapter": adapter, "adapter_callable": self.adapter_callable}
+        config_str = json.dumps(config, sort_keys=True, default=str)
+
+        return hashlib.blake2b(config_str.encode(), digest_size=16).hexdigest()
+
+    def _get_cache_dir(self) -> Optional[str]:
+        if self.cache_dir is None:
+            return None
+
+        cache_key = self._get_cache_key()
+        if cache_key is None:
+            self.logger.debug("adapter cannot be hashed: not caching dataset.")
+            return None
+
+        return os.path.join(os.path.expanduser(self.cache_dir), cache_key)
+
+    def _restore_cache(self, cache_dir: str) -> Optional[Tuple]:
+        X_path = os.path.join(cache_dir, "X.npy")
+        X_sparse_path = os.path.join(cache_dir, "X.npz")
+        y_path = os.path.join(cache_dir, "y.npy")
+        if not os.path.exists(y_path):
+            return None
+        elif os.path.exists(X_sparse_path):
+            return sparse.load_npz(X_sparse_path), np.load(y_path, allow_pickle=True)
+        elif not os.path.exists(X_path):
+            return None
+
+        # the data matrix is memory-mapped if requested; the target is always loaded.
+        mmap_mode = "r" if self.memmap else None
+        X = np.load(X_path, mmap_mode=mmap_mode, allow_pickle=not self.memmap)
+        y = np.load(y_path, allow_pickle=True)
+
+        return X, y
+
+    def _save_cache(self, cache_dir: str, X, y: np.ndarray):
+        """Saves the dataset to the cache. Files are written to a temporary file first
+        and then moved, such that concurrent runs never read a partially written file.
+        Sparse matrices are stored in the `.npz` format. The target is written last: it
+        marks the cache entry as complete."""
+        os.makedirs(cache_dir, exist_ok=True)
+
+        X_filename = "X.npz" if sparse.issparse(X) else "X.npy"
+        for filename, array in [(X_filename, X), ("y.npy", y)]:
+            path = os.path.join(cache_dir, filename)
+            fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "wb") as file_handle:
+                if sparse.issparse(array):
+                    sparse.save_npz(file_handle, array)
+                else:
+                    np.save(file_handle, array)
+            os.replace(tmp_path, path)
+
+    def _get_data(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Gets the data from the adapter, or from the dataset cache if enabled."""
+        cache_dir = self._get_cache_dir()
+
+        if cache_dir is not None:
+            data = self._restore_cache(cache_dir)
+            if data is not None:
+                self.logger.info(
+                    f"dataset cache {TerminalColor.green('hit')}: "
+                    + TerminalColor.blue(cache_dir)
+                )
+                return data
+
+            self.logger.info(
+                f"dataset cache {TerminalColor.yellow('miss')}: "
+                + TerminalColor.blue(cache_dir)
+            )
+
+        X, y = self._get_adapter_data()
+        if isinstance(X, ChunkedArray):
+            self.logger.info("dataset is chunked: streaming it instead of caching it.")
+            return X, y
+
+        # keep memory-mapped arrays on disk and sparse matrices sparse. sparse matrices
+        # are stored in CSR format: CV splits and resampling select rows.
+        if sparse.issparse(X):
+            X = X.tocsr()
+        elif not isinstance(X, np.memmap):
+            X = np.asarray(X)
+        y = y.toarray() if sparse.issparse(y) else np.asarray(y)
+
+        if cache_dir is not None:
+            self._save_cache(cache_dir, X, y)
+
+            # release the in-memory dataset in favor of the memory-mapped cache
+            if self.memmap:
+                return cast(Tuple, self._restore_cache(cache_dir))
+
+        return X, y
+
+    def _parse_feature_importances(self, n: int, p: int) -> List[Tuple[Tuple, float]]:
+        """Parses the ground-truth selectors, like `X[:, 0]`, into numpy indices. Both
+        the selectors and the values are evaluated in a sandbox; see
+        `fseval.utils.expression_utils`."""
         assert OmegaConf.is_dict(self.feature_importances) or isinstance(
             self.feature_importances, dict
         ), """dataset `feature_importances` ground truth must be a dict."""
+        feature_importances = cast(Dict, self.feature_importances)
 
-        # make variables accessible in current context
-        X = np.zeros_like(X)
-
-        # process feature importances
-        for selector, value in self.feature_importances.items():
+        parsed = []
+        for selector, value in feature_importances.items():
             assert (
                 re.match(r"X\[.*\]", selector) is not None
             ), f"incorrect feature_importances pattern: {selector} = {value}"
 
-            exec(f"{selector} = {value}")
+            # evaluating `X[...]` with `X` an index recorder yields the index itself
+            index = evaluate_expression(selector, X=_IndexRecorder(), n=n, p=p)
+            index = index if isinstance(index, tuple) else (index,)
+            assert len(index) <= 2, f"X is 2-dimensional, got selector {selector}"
+            index = tuple(slice(None) if i is Ellipsis else i for i in index)
+            index = index + (slice(None),) * (2 - len(index))  # (rows, columns)
+            value = evaluate_expression(str(value), n=n, p=p)
+
+            parsed.append((index, float(value)))
+
+        return parsed
+
+    def get_feature_importances(
+        self, X: Optional[np.ndarray], n: int, p: int
+    ) -> Optional[Union[np.ndarray, sparse.csr_matrix]]:
+        """Builds the ground-truth feature importances. When all selectors select
+        entire columns, e.g. `X[:, 0]`, a `p`-length vector is built directly.
+        Instance-based ground-truth, selecting specific rows, is built as a sparse
+        `(n, p)` matrix. Every row is normalized to sum to 1. `X` itself is unused:
+        only its shape, `n` and `p`, is needed."""
+        if self.feature_importances is None:
+            return None
+
+        parsed = self._parse_feature_importances(n, p)
+        selects_all_rows = lambda rows: isinstance(rows, slice) and rows == slice(None)
+
+        # column-only selectors: build a single row
+        if all(selects_all_rows(rows) for (rows, _), _ in parsed):
+            row = np.zeros(p)
+            for (_, columns), value in parsed:
+                row[columns] = value
+
+            return row / row.sum()
+
+        # instance-based selectors: build a sparse matrix
+        matrix = sparse.lil_matrix((n, p))
+        for index, value in parsed:
+            matrix[index] = value
+        matrix = matrix.tocsr()
 
         # normalize to make every row a probability vector
-        row_sums = X.sum(axis=1)
-        X = X / row_sums[:, np.newaxis]
+        row_sums = np.asarray(matrix.sum(axis=1)).ravel()
+        with np.errstate(divide="ignore"):
+            matrix = sparse.diags(1 / row_sums) @ matrix
+        matrix = sparse.csr_matrix(matrix)
+        matrix.sort_indices()
 
-        if np.isclose(X, X[0]).all():  # all rows are equal
-            return X[0]  # return first row
-        else:
-            return X  # return entire matrix
+        # all rows are equal: return first row
+        nnz = np.diff(matrix.indptr)
+        if (nnz == nnz[0]).all():
+            indices = matrix.indices.reshape(n, nnz[0])
+            data = matrix.data.reshape(n, nnz[0])
+            if (indices == indices[0]).all() and np.isclose(data, data[0]).all():
+                return matrix[0].toarray().ravel()
+
+        return matrix
+
+    def get_fingerprint(self, X, y) -> str:
+        """Stable identity of the loaded data, to key caches and deduplicate results.
+        Hashes the data, so is not computed by `load`: only once a cache or export
+        needs it. See `fseval.utils.hash_utils.fingerprint`."""
+        start_time = perf_counter()
+        dataset_fingerprint = fingerprint(X, y, max_blocks=self.fingerprint_blocks)
+        self.logger.debug(
+            f"fingerprinted dataset in {perf_counter() - start_time:.3f} seconds."
+        )
+
+        return dataset_fingerprint
 
     def load(self) -> Dataset:
         self.logger.info(f"task: {self.task.name}")
         self.logger.info(f"loading dataset {TerminalColor.yellow(self.name)}...")
-        X, y = self._get_adapter_data()
+        X, y = self._get_data()
+
+        if self.memmap and (sparse.issparse(X) or isinstance(X, ChunkedArray)):
+            self.logger.warning(
+                "`memmap` is not supported for sparse or chunked datasets."
+            )
+        elif self.memmap:
+            if not isinstance(X, np.memmap):
+                self.logger.warning(
+                    "`memmap` is enabled but the adapter returned an in-memory array: "
+                    + "return an `np.memmap` or configure a `cache_dir`."
+                )
+            X = IndexedArray(X)
 
-        X = np.asarray(X)
-        y = np.asarray(y)
         n = X.shape[0]
         p = X.shape[1]
         multioutput = y.ndim > 1
         feature_importances = self.get_feature_importances(X, n, p)
 
-        dataset = Dataset(self.name, X, y, n, p, multioutput, feature_importances)
+        # chunked datasets are fit chunk by chunk: classifiers need all classes up
+        # front, taken from the full target, since a chunk, fold or bootstrap might
+        # miss a class.
+        classes = None
+        if isinstance(X, ChunkedArray) and self.task == Task.classification:
+            classes = np.unique(y).tolist()
+
+        dataset = Dataset(
+            self.name,
+            X,
+            y,
+            n,
+            p,
+            multioutput,
+            feature_importances,
+            classes=classes,
+        )
         self.logger.info(
             f"loaded dataset {TerminalColor.yellow(self.name)} "
             + TerminalColor.green("✓")
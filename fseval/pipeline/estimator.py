@@ -1,12 +1,14 @@
 import inspect
+from contextlib import contextmanager
 from dataclasses import dataclass
 from logging import Logger, getLogger
 from time import perf_counter
-from typing import Dict, Union
+from typing import Dict, Optional, Tuple, Union
 
 import numpy as np
 import pandas as pd
 from omegaconf import MISSING
+from sklearn.metrics import accuracy_score, r2_score
 
 from fseval.config import EstimatorConfig
 from fseval.types import (
@@ -16,6 +18,7 @@ from fseval.types import (
     IncompatibilityError,
     Task,
 )
+from fseval.utils.array_utils import ChunkedArray
 
 
 @dataclass
@@ -25,6 +28,8 @@ class Estimator(AbstractEstimator, EstimatorConfig):
 
     logger: Logger = getLogger(__name__)
     _is_fitted: bool = False
+    _offloaded: Optional[Tuple[str, AbstractStorage]] = None
+    _offloaded_fit_time: Optional[float] = None
 
     def __post_init__(self):
         """Perform compatibility checks after initialization. Check whether this
@@ -55,6 +60,12 @@ class Estimator(AbstractEstimator, EstimatorConfig):
                 f"{self.name} only works on multioutput datasets."
             )
 
+        # chunked datasets: requires fitting chunk by chunk
+        if self.is_chunked_dataset and not hasattr(self.estimator, "partial_fit"):
+            raise IncompatibilityError(
+                f"dataset is chunked but {self.name} has no `partial_fit` support."
+            )
+
     @classmethod
     def _get_estimator_repr(cls, estimator):
         name = ""
@@ -91,7 +102,43 @@ class Estimator(AbstractEstimator, EstimatorConfig):
             self.logger.debug("cache saving set to `never`: not caching estimator.")
             return
         else:
-            storage.save_pickle(filename, self.estimator)
+            storage.save_pickle(filename, self._get_fitted_estimator())
+
+    def _offload(self, filename: str, storage: AbstractStorage):
+        """Saves the fitted estimator to storage and releases it from memory. Only a
+        lightweight handle is kept, and the fitting time: see `_get_fitted_estimator`."""
+        storage.save_pickle(filename, self.estimator)
+        self._offloaded_fit_time = self.fit_time_
+        self.estimator = None
+        self._offloaded = (filename, storage)
+
+    def _get_fitted_estimator(self):
+        """Returns the fitted estimator. An offloaded estimator is loaded from storage
+        every time it is used, but not kept: only the estimator that is currently
+        being saved or scored is in memory, instead of all of them."""
+        if self._offloaded is None:
+            return self.estimator
+
+        filename, storage = self._offloaded
+        self.logger.debug(f"loading offloaded estimator {filename}.")
+        return storage.restore_pickle(filename)
+
+    @contextmanager
+    def _restored(self):
+        """Keeps an offloaded estimator in memory within this context, such that it is
+        loaded only once - however often it is used. Released again afterwards."""
+        if self._offloaded is None:
+            yield self
+            return
+
+        offloaded = self._offloaded
+        self.estimator = self._get_fitted_estimator()
+        self._offloaded = None
+        try:
+            yield self
+        finally:
+            self.estimator = None
+            self._offloaded = offloaded
 
     def fit(self, X, y):
         # don't refit if cache available and `use_cache_if_available` is enabled
@@ -102,22 +149,54 @@ class Estimator(AbstractEstimator, EstimatorConfig):
         # fit
         self.logger.debug(f"Fitting {Estimator._get_class_repr(self)}...")
         start_time = perf_counter()
-        self.estimator.fit(X, y)
+        if isinstance(X, ChunkedArray):
+            self._partial_fit(X, y)
+        else:
+            self.estimator.fit(X, y)
         fit_time = perf_counter() - start_time
         self.fit_time_ = fit_time
 
         return self
 
+    def _partial_fit(self, X: ChunkedArray, y):
+        """Fits the estimator chunk by chunk. Classifiers are passed all classes of the
+        dataset, since a single chunk - or the fold or bootstrap - might not contain
+        every class."""
+        kwargs = {}
+        partial_fit_params = inspect.signature(self.estimator.partial_fit).parameters
+        if self.task == Task.classification and "classes" in partial_fit_params:
+            classes = self.dataset_classes
+            kwargs["classes"] = np.unique(y) if classes is None else np.asarray(classes)
+
+        for X_chunk, y_chunk in X.iter_chunks():
+            self.estimator.partial_fit(X_chunk, y_chunk, **kwargs)
+
+    def _score_chunked(self, estimator, X: ChunkedArray) -> float:
+        """Scores the estimator chunk by chunk, by predicting every chunk. Like
+        scikit-learn, classifiers are scored using accuracy and regressors using R^2."""
+        y_true, y_pred = [], []
+        for X_chunk, y_chunk in X.iter_chunks():
+            y_true.append(y_chunk)
+            y_pred.append(estimator.predict(X_chunk))
+
+        metric = accuracy_score if self.task == Task.classification else r2_score
+        return metric(np.concatenate(y_true), np.concatenate(y_pred))
+
     def score(self, X, y, **kwargs) -> Union[Dict, pd.DataFrame, np.generic, None]:
         self.logger.debug(f"Scoring {Estimator._get_class_repr(self)}...")
-        return self.estimator.score(X, y)
+        estimator = self._get_fitted_estimator()
+        if isinstance(X, ChunkedArray):
+            return self._score_chunked(estimator, X)
+
+        return estimator.score(X, y)
 
     @property
     def feature_importances_(self):
-        if hasattr(self.estimator, "feature_importances_"):
-            return self.estimator.feature_importances_
-        elif hasattr(self.estimator, "coef_"):
-            return self.estimator.coef_
+        estimator = self._get_fitted_estimator()
+        if hasattr(estimator, "feature_importances_"):
+            return estimator.feature_importances_
+        elif hasattr(estimator, "coef_"):
+            return estimator.coef_
         else:
             raise ValueError(
                 f"no `feature_importances_` found on {Estimator._get_class_repr(self)}"
@@ -125,16 +204,19 @@ class Estimator(AbstractEstimator, EstimatorConfig):
 
     @property
     def feature_support_(self):
-        return self.estimator.support_
+        return self._get_fitted_estimator().support_
 
     @property
     def feature_ranking_(self):
-        return self.estimator.ranking_
+        return self._get_fitted_estimator().ranking_
 
     @property
     def fit_time_(self):
         """ "Retrieves the estimator fitting time. Either the cached fitting time, or
         the time that was just recorded."""
+        if self._offloaded is not None:
+            return self._offloaded_fit_time
+
         return self.estimator._fseval_internal_fit_time_
 
     @fit_time_.setter
@@ -1,6 +1,11 @@
+import hashlib
+import json
 import logging
-from typing import Optional
+import os
+import tempfile
+from typing import List, Optional
 
+import numpy as np
 from sklearn.base import BaseEstimator, TransformerMixin
 from sklearn.utils import resample
 
@@ -12,13 +17,67 @@ logger = logging.getLogger(__name__)
 class Resample(ResampleConfig, BaseEstimator, TransformerMixin):
     n_samples: Optional[int] = None
     frac_samples: Optional[float] = None
+    # key of the CV split the data comes from. set at runtime, see `CrossValidator`.
+    split_key: Optional[str] = None
 
     def fit(self, *arrays, y=None):
         return self
 
+    def _get_cache_filenames(self, arrays) -> Optional[List[str]]:
+        """Filenames of the stored resample, one per array, keyed by the CV split and
+        the resampling config. Is `None` if the resample cannot be stored."""
+        if self.cache_dir is None:
+            return None
+        elif (
+            self.split_key is None
+            or not isinstance(self.random_state, (int, np.integer))
+            or self.stratify is not None
+            or not all(type(array) is np.ndarray for array in arrays)
+            # python objects, like string labels, cannot be memory-mapped
+            or any(array.dtype.hasobject for array in arrays)
+        ):
+            logger.debug(f"{self.name}: resample cannot be stored.")
+            return None
+
+        config = {
+            "split_key": self.split_key,
+            "replace": self.replace,
+            "sample_size": self.sample_size,
+            "random_state": int(self.random_state),
+            "shapes": [array.shape for array in arrays],
+        }
+        config_str = json.dumps(config, sort_keys=True, default=str)
+        cache_key = hashlib.blake2b(config_str.encode(), digest_size=16).hexdigest()
+        cache_dir = os.path.expanduser(self.cache_dir)
+
+        return [
+            os.path.join(cache_dir, f"resample-{cache_key}-{i}.npy")
+            for i in range(len(arrays))
+        ]
+
+    def _save_samples(self, filenames: List[str], samples: List[np.ndarray]):
+        """Saves the resampled arrays. Every array is written to a temporary file
+        first, and then moved, such that concurrent runs only see complete files."""
+        os.makedirs(os.path.dirname(filenames[0]), exist_ok=True)
+        for filename, sample in zip(filenames, samples):
+            fd, tmp_path = tempfile.mkstemp(
+                dir=os.path.dirname(filename), suffix=".tmp"
+            )
+            with os.fdopen(fd, "wb") as file_handle:
+                np.save(file_handle, sample)
+            os.replace(tmp_path, filename)
+
+    def _load_samples(self, filenames: List[str]):
+        """Memory-maps the stored resample, such that all runs share its pages. Maps
+        are copy-on-write: estimators can modify them, without changing the files."""
+        samples = [np.load(filename, mmap_mode="c") for filename in filenames]
+
+        return samples if len(samples) > 1 else samples[0]
+
     def transform(self, *arrays):
-        # assume arrays have equal amount of samples. `resample` also checks.
-        n = len(arrays[0])
+        # assume arrays have equal amount of samples. `resample` also checks. sparse
+        # matrices have no `len`.
+        n = np.shape(arrays[0])[0]
 
         if isinstance(self.sample_size, int):
             self.n_samples = self.sample_size
@@ -28,6 +87,16 @@ class Resample(ResampleConfig, BaseEstimator, TransformerMixin):
             self.n_samples = n
         self.frac_samples = self.n_samples / n
 
+        # attach to a resample stored by another run
+        filenames = self._get_cache_filenames(arrays)
+        if filenames is not None and all(map(os.path.exists, filenames)):
+            logger.info(
+                f"restored {self.n_samples} samples from {os.path.dirname(filenames[0])}"
+                + f" (random_state={self.random_state})"
+            )
+
+            return self._load_samples(filenames)
+
         samples = resample(
             *arrays,
             replace=self.replace,
@@ -42,4 +111,9 @@ class Resample(ResampleConfig, BaseEstimator, TransformerMixin):
             + f" (total samples: n={n}, random_state={self.random_state})"
         )
 
+        # store the resample, and share it with the other runs from now on
+        if filenames is not None:
+            self._save_samples(filenames, samples if len(arrays) > 1 else [samples])
+            return self._load_samples(filenames)
+
         return samples
@@ -1,4 +1,5 @@
-from typing import Dict, Optional
+from threading import RLock, local
+from typing import Callable, Dict, List, Optional, Tuple
 
 import pandas as pd
 from omegaconf import DictConfig
@@ -7,6 +8,10 @@ from fseval.types import Callback
 
 
 class CallbackCollection(Callback):
+    """Dispatches every callback call to all configured callbacks. Calls are
+    serialized using a lock, such that the callbacks can safely be used from multiple
+    threads at once."""
+
     def __init__(self, **callbacks):
         super(CallbackCollection, self).__init__()
 
@@ -16,31 +21,124 @@ class CallbackCollection(Callback):
             setattr(self, callback_name, callback)
 
         self.callback_names = callback_names
+        self._tags: Dict = {}
+        self._lock = RLock()
+
+    def __getstate__(self):
+        """Locks cannot be pickled: leave it out when sending to another process."""
+        state = self.__dict__.copy()
+        state.pop("_lock", None)
+
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = RLock()
+
+    def set_tags(self, **tags):
+        """Adds the tags as columns to every table passed to `on_table`, e.g. the CV
+        fold when all folds run in one process."""
+        self._tags = tags
 
     @property
     def _iterator(self):
         return [getattr(self, callback_name) for callback_name in self.callback_names]
 
     def on_begin(self, config: DictConfig):
-        for callback in self._iterator:
-            callback.on_begin(config)
+        with self._lock:
+            for callback in self._iterator:
+                callback.on_begin(config)
 
     def on_config_update(self, config: Dict):
-        for callback in self._iterator:
-            callback.on_config_update(config)
+        with self._lock:
+            for callback in self._iterator:
+                callback.on_config_update(config)
 
     def on_metrics(self, metrics):
-        for callback in self._iterator:
-            callback.on_metrics(metrics)
+        with self._lock:
+            for callback in self._iterator:
+                callback.on_metrics(metrics)
 
     def on_table(self, df: pd.DataFrame, name: str):
-        for callback in self._iterator:
-            callback.on_table(df, name)
+        if self._tags:
+            df = df.assign(**self._tags)
+
+        with self._lock:
+            for callback in self._iterator:
+                callback.on_table(df, name)
 
     def on_summary(self, summary):
-        for callback in self._iterator:
-            callback.on_summary(summary)
+        with self._lock:
+            for callback in self._iterator:
+                callback.on_summary(summary)
 
     def on_end(self, exit_code: Optional[int] = None):
-        for callback in reversed(self._iterator):
-            callback.on_end(exit_code)
+        with self._lock:
+            for callback in reversed(self._iterator):
+                callback.on_end(exit_code)
+
+
+class CallbackRecorder(Callback):
+    """Records all callback invocations, such that they can be replayed at a later
+    point in time. Allows running pipeline steps in another process, where the actual
+    callbacks are not available: the recorded calls are sent back to the main process
+    and replayed there. Calls are recorded per thread, such that multiple tasks can be
+    recorded at once, e.g. in a threaded worker of a distributed cluster."""
+
+    def __init__(self):
+        super(CallbackRecorder, self).__init__()
+        self._local = local()
+
+    def __getstate__(self):
+        """Thread-local storage cannot be pickled. Recorded calls are not sent along."""
+        state = self.__dict__.copy()
+        state.pop("_local", None)
+
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._local = local()
+
+    @property
+    def calls(self) -> List[Tuple[str, Tuple]]:
+        """The calls recorded in the current thread."""
+        if not hasattr(self._local, "calls"):
+            self._local.calls = []
+
+        return self._local.calls
+
+    def pop_calls(self) -> List[Tuple[str, Tuple]]:
+        """Returns the calls recorded in the current thread, and clears them."""
+        calls = self.calls
+        self._local.calls = []
+
+        return calls
+
+    def _record(self, name: str, *args):
+        self.calls.append((name, args))
+
+    def on_begin(self, config: DictConfig):
+        self._record("on_begin", config)
+
+    def on_config_update(self, config: Dict):
+        self._record("on_config_update", config)
+
+    def on_metrics(self, metrics):
+        self._record("on_metrics", metrics)
+
+    def on_table(self, df: pd.DataFrame, name: str):
+        self._record("on_table", df, name)
+
+    def on_summary(self, summary):
+        self._record("on_summary", summary)
+
+    def on_end(self, exit_code: Optional[int] = None):
+        self._record("on_end", exit_code)
+
+    @staticmethod
+    def replay(calls: List[Tuple[str, Tuple]], callback: Callback):
+        """Replays recorded calls onto some callback."""
+        for name, args in calls:
+            callback_method: Callable = getattr(callback, name)
+            callback_method(*args)
@@ -0,0 +1,268 @@
+import multiprocessing
+from collections import deque
+from dataclasses import dataclass
+from logging import Logger, getLogger
+from time import perf_counter
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from humanfriendly import format_timespan
+from joblib import Parallel, delayed
+from scipy import sparse
+from threadpoolctl import threadpool_limits
+
+PROCESS_BACKENDS: List[str] = ["multiprocessing", "loky"]
+DISTRIBUTED_BACKENDS: List[str] = ["dask", "ray"]
+BACKENDS: List[str] = [
+    "multiprocessing",
+    "loky",
+    "threading",
+    "sequential",
+] + DISTRIBUTED_BACKENDS
+SCHEDULERS: List[str] = ["static", "cost_aware"]
+
+
+def _call_with_thread_limit(func: Callable, inner_threads: Optional[int], *args) -> Any:
+    """Calls `func` whilst limiting the BLAS and OpenMP thread pools. Runs inside the
+    worker process, such that the limits apply to the worker only. Arguments are
+    passed unpacked, such that distributed backends resolve any shared objects."""
+    with threadpool_limits(limits=inner_threads):
+        return func(*args)
+
+
+def _call_timed(func: Callable, *args) -> Tuple[Any, float]:
+    """Calls `func` and measures its running time."""
+    start_time = perf_counter()
+    result = func(*args)
+
+    return result, perf_counter() - start_time
+
+
+@dataclass
+class Executor:
+    """Runs tasks in parallel using one of the joblib backends: `multiprocessing`,
+    `loky`, `threading` or `sequential`. To prevent oversubscription, the BLAS and
+    OpenMP thread pools inside each worker are capped to `cpu_count / n_jobs` threads.
+
+    Alternatively, tasks can be shipped to a `dask` or `ray` cluster, at `address`.
+    When no address is given, an existing client or cluster is used; or otherwise, a
+    local cluster is started. Arrays shared by all tasks, like the dataset, are put
+    in the cluster object store only once. At most `2 * n_jobs` tasks are in flight.
+
+    With the `cost_aware` scheduler, the caller provides estimated task costs: see
+    `starmap`.
+    """
+
+    backend: str = "multiprocessing"
+    n_jobs: int = 1
+    address: Optional[str] = None
+    scheduler: str = "static"
+
+    logger: Logger = getLogger(__name__)
+
+    def __post_init__(self):
+        assert self.backend in BACKENDS, (
+            f"unknown backend `{self.backend}`. "
+            + f"must be one of: {', '.join(BACKENDS)}."
+        )
+        assert (
+            self.n_jobs >= 1 or self.n_jobs == -1
+        ), f"incorrect `n_jobs`: {self.n_jobs}"
+        assert self.scheduler in SCHEDULERS, (
+            f"unknown scheduler `{self.scheduler}`. "
+            + f"must be one of: {', '.join(SCHEDULERS)}."
+        )
+
+    @property
+    def cpus(self) -> int:
+        """Amount of CPU's to use. ALL if n_jobs is -1, else n_jobs."""
+        return multiprocessing.cpu_count() if self.n_jobs == -1 else self.n_jobs
+
+    @property
+    def inner_threads(self) -> int:
+        """Amount of BLAS/OpenMP threads each worker is allowed to use."""
+        return max(1, multiprocessing.cpu_count() // self.cpus)
+
+    @property
+    def is_distributed(self) -> bool:
+        """Whether tasks are run on a cluster, i.e. possibly on other machines."""
+        return self.backend in DISTRIBUTED_BACKENDS
+
+    @property
+    def is_process_based(self) -> bool:
+        """Whether tasks are run in other processes, i.e. whether their inputs and
+        outputs have to be pickled."""
+        return self.backend in PROCESS_BACKENDS or self.is_distributed
+
+    def starmap(
+        self, func: Callable, iterable: Iterable[Tuple], costs: Optional[List] = None
+    ) -> List:
+        """Like `multiprocessing.Pool.starmap`. The iterable is consumed lazily: at
+        most `2 * cpus` tasks are dispatched ahead of the running ones. Results are
+        returned in order.
+
+        When the estimated `costs` of the tasks are given, tasks are scheduled
+        cost-aware: the longest tasks are dispatched first, one at a time, to whichever
+        worker becomes idle first. This prevents a few long-running stragglers from
+        dominating the makespan, which is reported once all tasks finished."""
+        tasks: Iterable[Tuple] = iterable
+        order: List[int] = []
+        if costs is not None:
+            task_list = list(iterable)
+            assert len(costs) == len(task_list), "every task must have a cost."
+            order = sorted(range(len(task_list)), key=lambda i: -costs[i])
+            tasks = (task_list[i] for i in order)
+
+        timed_tasks = ((func, *args) for args in tasks)
+        start_time = perf_counter()
+        if self.is_distributed:
+            timed_results = self._distributed_starmap(_call_timed, timed_tasks)
+        else:
+            batch_size = 1 if costs is not None else "auto"
+            timed_results = self._parallel_starmap(_call_timed, timed_tasks, batch_size)
+        makespan = perf_counter() - start_time
+
+        results = [result for result, _ in timed_results]
+        task_time = sum(seconds for _, seconds in timed_results)
+        self._log_makespan(makespan, task_time, costs is not None)
+
+        # restore input order
+        if costs is not None:
+            ordered_results: List = [None] * len(results)
+            for result, i in zip(results, order):
+                ordered_results[i] = result
+            results = ordered_results
+
+        return results
+
+    def _log_makespan(self, makespan: float, task_time: float, cost_aware: bool):
+        self.makespan_ = makespan
+        utilization = task_time / (makespan * self.cpus) if makespan > 0 else 1.0
+        scheduling = "cost-aware" if cost_aware else "static"
+        self.logger.info(
+            f"makespan {format_timespan(makespan)} using {scheduling} scheduling: "
+            + f"workers were busy {utilization:.0%} of the time."
+        )
+
+    def _parallel_starmap(
+        self, func: Callable, iterable: Iterable[Tuple], batch_size: Any = "auto"
+    ) -> List:
+        self.logger.info(
+            f"Using {self.cpus} CPU's in parallel (n_jobs={self.n_jobs}, "
+            + f"backend={self.backend}, inner_threads={self.inner_threads})"
+        )
+        parallel = Parallel(
+            n_jobs=self.cpus,
+            backend=self.backend,
+            pre_dispatch="2 * n_jobs",
+            batch_size=batch_size,
+        )
+
+        if self.is_process_based:
+            tasks = (
+                delayed(_call_with_thread_limit)(func, self.inner_threads, *args)
+                for args in iterable
+            )
+            return parallel(tasks)
+        else:
+            # thread pool limits are process-wide: set them once for all threads.
+            with threadpool_limits(limits=self.inner_threads):
+                return parallel(delayed(func)(*args) for args in iterable)
+
+    def _put_shared(self, put: Callable, iterable: Iterable[Tuple]) -> Iterator[Tuple]:
+        """Replaces arrays in the task arguments by references into the object store.
+        Arrays are identified by object identity, so every array is put only once."""
+        shared: Dict[int, Tuple[Any, Any]] = {}
+
+        def share(arg):
+            if not (
+                isinstance(arg, (np.ndarray, pd.DataFrame, pd.Series))
+                or sparse.issparse(arg)
+            ):
+                return arg
+            if id(arg) not in shared:
+                # keep a reference to the array, such that its id is not reused.
+                shared[id(arg)] = (arg, put(arg))
+            _, reference = shared[id(arg)]
+            return reference
+
+        for args in iterable:
+            yield tuple(share(arg) for arg in args)
+
+    def _windowed_map(
+        self, submit: Callable, result: Callable, iterable: Iterable[Tuple]
+    ) -> List:
+        """Submits tasks whilst keeping at most `2 * cpus` of them in flight, waiting
+        for the oldest task first. Results are returned in order."""
+        results: List = []
+        in_flight: deque = deque()
+
+        for args in iterable:
+            in_flight.append(submit(*args))
+            if len(in_flight) >= 2 * self.cpus:
+                results.append(result(in_flight.popleft()))
+        while in_flight:
+            results.append(result(in_flight.popleft()))
+
+        return results
+
+    def _distributed_starmap(self, func: Callable, iterable: Iterable[Tuple]) -> List:
+        self.logger.info(
+            f"Distributing tasks over a {self.backend} cluster (address="
+            + f"{self.address or 'local'}, max. {2 * self.cpus} tasks in flight)"
+        )
+
+        if self.backend == "dask":
+            return self._dask_starmap(func, iterable)
+        else:
+            return self._ray_starmap(func, iterable)
+
+    def _dask_starmap(self, func: Callable, iterable: Iterable[Tuple]) -> List:
+        try:
+            from distributed import Client, default_client
+        except ImportError as e:
+            raise ImportError(
+                "the `dask` backend requires dask distributed: "
+                + "`pip install dask[distributed]`."
+            ) from e
+
+        # connect to the cluster. only close the client if it was created here.
+        owns_client = True
+        if self.address:
+            client = Client(self.address)
+        else:
+            try:
+                client = default_client()
+                owns_client = False
+            except ValueError:
+                client = Client(processes=False, dashboard_address=None)
+
+        try:
+            put = lambda arg: client.scatter(arg, broadcast=True)
+            submit = lambda *args: client.submit(
+                _call_with_thread_limit, func, None, *args, pure=False
+            )
+            result = lambda future: future.result()
+
+            return self._windowed_map(submit, result, self._put_shared(put, iterable))
+        finally:
+            if owns_client:
+                client.close()
+
+    def _ray_starmap(self, func: Callable, iterable: Iterable[Tuple]) -> List:
+        try:
+            import ray
+        except ImportError as e:
+            raise ImportError(
+                "the `ray` backend requires ray: `pip install ray`."
+            ) from e
+
+        # connect to the cluster, or start a local one.
+        if not ray.is_initialized():
+            ray.init(address=self.address)
+
+        remote = ray.remote(_call_with_thread_limit)
+        submit = lambda *args: remote.remote(func, None, *args)
+
+        return self._windowed_map(submit, ray.get, self._put_shared(ray.put, iterable))
@@ -1,7 +1,9 @@
-import multiprocessing
+import weakref
 from dataclasses import dataclass, field
-from functools import reduce
+from functools import partial
 from logging import Logger, getLogger
+from shutil import rmtree
+from tempfile import mkdtemp
 from time import perf_counter
 from typing import Dict, List, Tuple, Union
 
@@ -10,7 +12,10 @@ import pandas as pd
 from humanfriendly import format_timespan
 
 from fseval.pipeline.estimator import Estimator
-from fseval.types import AbstractEstimator, Callback, TerminalColor
+from fseval.pipelines._callback_collection import CallbackRecorder
+from fseval.pipelines._executor import Executor
+from fseval.storage.local import LocalStorage
+from fseval.types import AbstractEstimator, AbstractStorage, Callback, TerminalColor
 
 
 @dataclass
@@ -19,11 +24,106 @@ class Experiment(AbstractEstimator):
     logger: Logger = getLogger(__name__)
 
     def __post_init__(self):
-        self.estimators = list(self._get_estimator())
+        self.reset()
+
+    def reset(self):
+        """Constructs the estimators of this experiment afresh, such that the
+        experiment can be fit again, e.g. on another CV fold."""
+        if self._is_streaming():
+            # construct only the first estimator up front, such that any
+            # incompatibilities are still raised upon instantiation. all estimators
+            # are constructed on-the-fly in `fit_score`.
+            next(iter(self._get_estimator()), None)
+            self.estimators = []
+        else:
+            self.estimators = list(self._get_estimator())
 
     def _get_n_jobs(self):
         return None
 
+    def _is_streaming(self):
+        return False
+
+    def _is_memory_lean(self):
+        return False
+
+    def _is_offloading(self):
+        return False
+
+    def _get_backend(self):
+        return "multiprocessing"
+
+    def _get_cluster_address(self):
+        return None
+
+    def _get_scheduler(self):
+        return "static"
+
+    def _get_executor(self, n_jobs: int) -> Executor:
+        return Executor(
+            backend=self._get_backend(),
+            n_jobs=n_jobs,
+            address=self._get_cluster_address(),
+            scheduler=self._get_scheduler(),
+        )
+
+    def _get_data_shape(self, n: int, p: int) -> Tuple[int, int]:
+        """Shape of the data the estimators in this experiment are fit on, given the
+        shape of the data passed to this experiment."""
+        return n, p
+
+    def _iter_fit_units(self, estimator, n: int, p: int):
+        """Yields all estimators that are fit when fitting `estimator`, together with
+        the shape of the data they are fit on."""
+        if isinstance(estimator, Experiment):
+            n, p = estimator._get_data_shape(n, p)
+            for child_estimator in estimator.estimators:
+                yield from estimator._iter_fit_units(child_estimator, n, p)
+        elif isinstance(estimator, Estimator):
+            yield estimator, n, p
+
+    def _estimate_costs(self, X, estimators: List) -> List[float]:
+        """Estimates the cost of fitting each estimator, relative to each other. The
+        cost of a fit is proportional to the size of its data, `n * p`, multiplied by
+        the time the estimator takes per data element. That rate is taken from the
+        historical fit times of cached estimators, if any. Cached estimators themselves
+        cost nothing: their fit is skipped. The size is read from the `shape` of the
+        data, so lazy or chunked data is not materialized."""
+        n, p = X.shape[:2] if hasattr(X, "shape") else np.shape(X)[:2]
+        fit_units = [list(self._iter_fit_units(e, n, p)) for e in estimators]
+
+        # historical fit time per data element, per estimator name
+        rates: Dict[str, List[float]] = {}
+        for units in fit_units:
+            for estimator, n_unit, p_unit in units:
+                if not estimator._is_fitted:
+                    continue
+                try:
+                    fit_time = estimator.fit_time_
+                except AttributeError:
+                    continue
+                rates.setdefault(estimator.name, []).append(
+                    fit_time / (n_unit * p_unit)
+                )
+        all_rates = [rate for name_rates in rates.values() for rate in name_rates]
+        default_rate = float(np.mean(all_rates)) if all_rates else 1.0
+
+        costs = []
+        for units in fit_units:
+            cost = 0.0
+            for estimator, n_unit, p_unit in units:
+                if estimator._is_fitted:
+                    continue
+                name_rates = rates.get(estimator.name)
+                rate = float(np.mean(name_rates)) if name_rates else default_rate
+                cost += n_unit * p_unit * rate
+            costs.append(cost)
+
+        return costs
+
+    def _get_n_estimators(self):
+        return len(self.estimators)
+
     def _get_estimator(self):
         return []
 
@@ -42,7 +142,7 @@ class Experiment(AbstractEstimator):
 
         # step text variables
         step = step_number + 1
-        n_steps = len(self.estimators)
+        n_steps = self._get_n_estimators()
         overrides_text = self._get_overrides_text(estimator)
         estimator_repr = self._get_estimator_repr(estimator)
 
@@ -83,6 +183,25 @@ class Experiment(AbstractEstimator):
 
         return estimator
 
+    def _fit_offload_estimator(
+        self, X, y, step_number, estimator, storage: AbstractStorage
+    ):
+        """Fits the estimator, after which all fitted estimators are offloaded to
+        storage. Used in worker processes, to avoid sending large fitted estimators
+        back to the main process."""
+        estimator = self._fit_estimator(X, y, step_number, estimator)
+        self._offload_estimator(estimator, storage)
+
+        return estimator
+
+    def _offload_estimator(self, estimator, storage: AbstractStorage):
+        if isinstance(estimator, Experiment):
+            for child_estimator in estimator.estimators:
+                estimator._offload_estimator(child_estimator, storage)
+        elif isinstance(estimator, Estimator):
+            filename = getattr(self, "_cache_filename")
+            estimator._offload(filename, storage)
+
     def _remove_and_get_callbacks(self) -> Tuple[Dict[str, Callback], List[str]]:
         """
         Removes callbacks from this Experiment object. Returns them as a
@@ -128,19 +247,19 @@ class Experiment(AbstractEstimator):
             X (np.ndarray): design matrix X
             y (np.ndarray): target labels y"""
 
+        if self._is_streaming():
+            raise ValueError(
+                "streaming experiments construct, fit and score their estimators "
+                + "on-the-fly, e.g. when memory-lean: use `fit_score` instead of "
+                + "`fit` and `score`."
+            )
+
         X, y = self._prepare_data(X, y)
 
         ## Run `fit`
         n_jobs = self._get_n_jobs()
         if n_jobs is not None and (n_jobs > 1 or n_jobs == -1):
-            assert n_jobs >= 1 or n_jobs == -1, f"incorrect `n_jobs`: {n_jobs}"
-
-            # remove callbacks this object and store locally in main thread.
-            callback_objects, callback_names = self._remove_and_get_callbacks()
-
-            # determine amount of CPU's to use. ALL if n_jobs is -1, else n_jobs.
-            cpus = multiprocessing.cpu_count() if n_jobs == -1 else n_jobs
-            self.logger.info(f"Using {cpus} CPU's in parallel (n_jobs={n_jobs})")
+            executor = self._get_executor(n_jobs)
 
             # input to `self._fit_esitmator`
             star_input = [
@@ -148,14 +267,42 @@ class Experiment(AbstractEstimator):
                 for step_number, estimator in enumerate(self.estimators)
             ]
 
-            # open pool and fit estimators.
-            pool = multiprocessing.Pool(processes=cpus)
-            estimators = pool.starmap(self._fit_estimator, star_input)
-            pool.close()
-            pool.join()
-
-            # restore callbacks in main thread
-            self._set_callbacks(callback_objects, callback_names)
+            # when offloading, workers save fitted estimators to a temporary storage
+            # and send back only lightweight handles to them. requires the workers to
+            # share a filesystem with the main process.
+            fit_estimator = self._fit_estimator
+            if (
+                self._is_offloading()
+                and executor.is_process_based
+                and not executor.is_distributed
+            ):
+                offload_dir = mkdtemp(prefix="fseval_offload_")
+                weakref.finalize(self, rmtree, offload_dir, True)
+                offload_storage = LocalStorage(
+                    load_dir=offload_dir, save_dir=offload_dir
+                )
+                fit_estimator = partial(
+                    self._fit_offload_estimator, storage=offload_storage
+                )
+                self.logger.info(f"Offloading fitted estimators to: {offload_dir}")
+
+            # estimate task costs, such to schedule the longest tasks first.
+            costs = None
+            if executor.scheduler == "cost_aware":
+                costs = self._estimate_costs(X, self.estimators)
+
+            # remove callbacks this object and store locally in main thread. only
+            # necessary when the estimators are pickled to other processes.
+            if executor.is_process_based:
+                callback_objects, callback_names = self._remove_and_get_callbacks()
+
+            # fit estimators.
+            try:
+                estimators = executor.starmap(fit_estimator, star_input, costs=costs)
+            finally:
+                # restore callbacks in main thread
+                if executor.is_process_based:
+                    self._set_callbacks(callback_objects, callback_names)
 
             # set collected estimators to this local object
             self.estimators = estimators
@@ -175,44 +322,46 @@ class Experiment(AbstractEstimator):
             ):
                 estimator.postfit()
 
-    def _aggregate_dataframe_scores(self, a: pd.DataFrame, b: pd.DataFrame):
-        return pd.concat([a, b])
-
-    def _aggregate_dict_scores(self, a: Dict, b: Dict):
-        aggregated = {}
+    def _aggregate_dataframe_scores(self, scores: List[pd.DataFrame]) -> pd.DataFrame:
+        """Concatenates all DataFrames at once, instead of pairwise. Pairwise
+        concatenation copies the accumulated frame again for every estimator."""
+        return pd.concat(scores)
 
-        # merge common keys
-        common_keys_filter = filter(lambda key: key in b, a)
-        common_keys = list(common_keys_filter)
+    def _aggregate_dict_scores(self, scores: List[Dict]) -> Dict:
+        """Collects the values of each key into a list first, then aggregates every
+        key exactly once. Keys that only occur in one dict are kept as-is."""
+        collected: Dict[str, List] = {}
 
-        for key in common_keys:
-            value_a = a.pop(key)
-            value_b = b.pop(key)
-            aggregated[key] = self._aggregate_scores(value_a, value_b)
+        for score in scores:
+            for key, value in score.items():
+                collected.setdefault(key, []).append(value)
 
-        # add remaining uncommon keys
-        aggregated = {**aggregated, **a, **b}
+        aggregated = {
+            key: self._aggregate_scores(values) for key, values in collected.items()
+        }
 
         return aggregated
 
-    def _aggregate_scores(
-        self, a: Union[pd.DataFrame, Dict], b: Union[pd.DataFrame, Dict]
-    ):
-        is_dataframe = isinstance(a, pd.DataFrame) and isinstance(b, pd.DataFrame)
-        is_dict = isinstance(a, Dict) and isinstance(b, Dict)
+    def _aggregate_scores(self, scores: List[Union[pd.DataFrame, Dict]]):
+        if len(scores) == 1:
+            return scores[0]
+
+        is_dataframe = all(isinstance(score, pd.DataFrame) for score in scores)
+        is_dict = all(isinstance(score, Dict) for score in scores)
 
         if is_dataframe:
-            agg_scores = self._aggregate_dataframe_scores(a, b)
+            agg_scores = self._aggregate_dataframe_scores(scores)
             return agg_scores
         elif is_dict:
-            agg_scores = self._aggregate_dict_scores(a, b)
+            agg_scores = self._aggregate_dict_scores(scores)
             return agg_scores
         else:
+            types = sorted(set(type(score).__name__ for score in scores))
             raise ValueError(
                 "In an `Experiment`, all estimators must either return only DataFrames "
                 + "or Dictionaries containing DataFrames. Otherwise, the experiment "
                 + "results cannot be aggregated. Got: "
-                + f"{type(a)} and {type(b)}."
+                + f"{', '.join(types)}."
             )
 
     def score(self, X, y, **kwargs) -> Union[Dict, pd.DataFrame, np.generic, None]:
@@ -223,6 +372,122 @@ class Experiment(AbstractEstimator):
 
         # score all estimators and aggregate
         scores = [estimator.score(X, y, **kwargs) for estimator in self.estimators]
-        scores_agg = reduce(self._aggregate_scores, scores)
+        scores_agg = self._aggregate_scores(scores)
+
+        return scores_agg
+
+    def _fit_score_estimator(
+        self, X, y, X_test, y_test, step_number, estimator, **kwargs
+    ) -> Union[Dict, pd.DataFrame, np.generic, None]:
+        # memory-lean experiments fuse fitting and scoring all the way down.
+        if isinstance(estimator, Experiment) and estimator._is_memory_lean():
+            logger = self._logger(estimator)
+            text = self._step_text("fit_score", step_number, estimator)
+
+            start_time = perf_counter()
+            scores = estimator.fit_score(X, y, X_test, y_test, **kwargs)
+            fit_score_time = perf_counter() - start_time
+            logger(text(fit_score_time))
+
+            return scores
+
+        if hasattr(estimator, "prefit") and callable(getattr(estimator, "prefit")):
+            estimator.prefit()
+
+        self._fit_estimator(X, y, step_number, estimator)
+
+        if hasattr(estimator, "postfit") and callable(getattr(estimator, "postfit")):
+            estimator.postfit()
+
+        return estimator.score(X_test, y_test, **kwargs)
+
+    def _fit_score_worker(
+        self, X, y, X_test, y_test, step_number, estimator, **kwargs
+    ) -> Tuple[Union[Dict, pd.DataFrame, np.generic, None], List]:
+        """Runs `_fit_score_estimator` in a worker process. Returns the scores and the
+        recorded callback calls: the fitted estimator itself is not sent back. Only
+        the calls recorded for this estimator are returned, also when a worker runs
+        multiple estimators using the same copy of this object."""
+        scores = self._fit_score_estimator(
+            X, y, X_test, y_test, step_number, estimator, **kwargs
+        )
+        callback_calls = self.callbacks.recorder.pop_calls()
+
+        return scores, callback_calls
+
+    def fit_score(
+        self, X, y, X_test, y_test, **kwargs
+    ) -> Union[Dict, pd.DataFrame, np.generic, None]:
+        """Streams over all estimators in this experiment. Each estimator is
+        constructed, pre-fit, fit, post-fit and scored, after which it is released
+        before the next estimator is constructed. Only the scores are kept. When
+        running in parallel, each worker runs this entire sequence for its estimator
+        and only sends the scores back.
+
+        Attributes:
+            X (np.ndarray): design matrix X, used for fitting.
+            y (np.ndarray): target labels y, used for fitting.
+            X_test (np.ndarray): design matrix X, used for scoring.
+            y_test (np.ndarray): target labels y, used for scoring."""
+
+        X, y = self._prepare_data(X, y)
+        X_test, y_test = self._prepare_data(X_test, y_test)
+
+        ## Run `fit_score`
+        n_jobs = self._get_n_jobs()
+        if n_jobs is not None and (n_jobs > 1 or n_jobs == -1):
+            executor = self._get_executor(n_jobs)
+
+            # input to `self._fit_score_estimator`. estimators are constructed
+            # on-the-fly, whilst the executor consumes its input. none of them is fit
+            # yet, so their costs are unknown: also cost-aware schedulers schedule
+            # statically.
+            star_input = (
+                (X, y, X_test, y_test, step_number, estimator)
+                for step_number, estimator in enumerate(self._get_estimator())
+            )
+            if executor.scheduler == "cost_aware":
+                self.logger.info(
+                    "streaming: skipping cost estimation, scheduling statically."
+                )
+
+            # when the estimators are pickled to other processes, remove callbacks
+            # this object and store locally in main thread. workers record their
+            # callback calls instead, which are replayed in the main thread afterwards.
+            if executor.is_process_based:
+                callback_objects, callback_names = self._remove_and_get_callbacks()
+                self.callbacks.recorder = CallbackRecorder()
+                self.callbacks.callback_names = ["recorder"]
+                fit_score_estimator = partial(self._fit_score_worker, **kwargs)
+            else:
+                fit_score_estimator = partial(self._fit_score_estimator, **kwargs)
+
+            # fit and score estimators. when process-based, only the scores are sent
+            # back to the main thread.
+            try:
+                results = executor.starmap(fit_score_estimator, star_input)
+            finally:
+                if executor.is_process_based:
+                    # restore callbacks in main thread
+                    delattr(self.callbacks, "recorder")
+                    self._set_callbacks(callback_objects, callback_names)
+
+            # replay recorded callback calls
+            if executor.is_process_based:
+                scores = []
+                for estimator_scores, callback_calls in results:
+                    CallbackRecorder.replay(callback_calls, self.callbacks)
+                    scores.append(estimator_scores)
+            else:
+                scores = results
+        else:
+            scores = [
+                self._fit_score_estimator(
+                    X, y, X_test, y_test, step_number, estimator, **kwargs
+                )
+                for step_number, estimator in enumerate(self._get_estimator())
+            ]
+
+        scores_agg = self._aggregate_scores(scores)
 
         return scores_agg
@@ -24,9 +24,31 @@ class RankAndValidatePipeline(Pipeline):
     validator: Estimator = MISSING
     n_bootstraps: int = MISSING
     n_jobs: Optional[int] = MISSING
+    backend: str = MISSING
+    cluster_address: Optional[str] = MISSING
+    scheduler: str = MISSING
     all_features_to_select: str = MISSING
+    streaming: bool = MISSING
+    memory_lean: bool = MISSING
+    offload_fitted: bool = MISSING
+    checkpoint: bool = MISSING
+    early_stopping: bool = MISSING
+    early_stopping_tol: float = MISSING
+    early_stopping_patience: int = MISSING
+    bootstrap_ci_width: Optional[float] = MISSING
     metrics: Dict[str, AbstractMetric] = MISSING
 
+    def _is_fit_scoring_subsets(self) -> bool:
+        """Whether each feature subset is scored right after it was fit, instead of
+        fitting all subsets first and scoring them afterwards. Checkpointing does so
+        too, such that each checkpoint is saved as soon as its subset is scored."""
+        return self.memory_lean or self.early_stopping or self.checkpoint
+
+    def _get_fold_override(self) -> str:
+        """Prefix for the override in cache filenames. When all CV folds run in one
+        process, they share one storage: their files are then told apart by fold."""
+        return f"fold={self.cv.fold}," if self.cv.all_folds else ""
+
     def _get_config(self):
         return {
             key: getattr(self, key)
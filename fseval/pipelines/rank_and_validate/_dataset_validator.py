@@ -7,6 +7,7 @@ from omegaconf import MISSING
 from sklearn.base import clone
 
 from fseval.pipeline.estimator import Estimator
+from fseval.utils.expression_utils import evaluate_subset_grid
 
 from .._experiment import Experiment
 from ._config import RankAndValidatePipeline
@@ -19,6 +20,9 @@ class DatasetValidator(Experiment, RankAndValidatePipeline):
     at most `p` feature subsets, at each step incrementally including more top-features."""
 
     bootstrap_state: int = MISSING
+    _best_score: float = -np.inf
+    _n_stale: int = 0
+    _n_fits: int = 0
 
     def _get_all_features_to_select(self, n: int, p: int) -> List[int]:
         """parse all features to select from config"""
@@ -27,16 +31,10 @@ class DatasetValidator(Experiment, RankAndValidatePipeline):
             n > 0 and p > 0
         ), f"dataset must have > 0 samples (n was {n} and p was {p})"
 
-        # set using `exec`
-        localz = locals()
-        exec(
-            f"all_features_to_select = {self.all_features_to_select}",
-            globals(),
-            localz,
+        # evaluate the expression in a sandbox. cached: evaluated once per dataset.
+        all_features_to_select = list(
+            evaluate_subset_grid(self.all_features_to_select, n, p)
         )
-        all_features_to_select = localz["all_features_to_select"]
-        all_features_to_select = cast(List[int], all_features_to_select)
-        all_features_to_select = list(all_features_to_select)
 
         assert (
             all_features_to_select
@@ -44,6 +42,18 @@ class DatasetValidator(Experiment, RankAndValidatePipeline):
 
         return all_features_to_select
 
+    def _is_streaming(self):
+        """Construct feature subsets on-the-fly when fit-scoring them, see
+        `_is_fit_scoring_subsets`."""
+
+        return self._is_fit_scoring_subsets()
+
+    def _get_n_estimators(self):
+        if self._is_fit_scoring_subsets():
+            return len(self._get_all_features_to_select(self.dataset.n, self.dataset.p))
+        else:
+            return len(self.estimators)
+
     def _get_estimator(self):
         all_features_to_select = self._get_all_features_to_select(
             self.dataset.n, self.dataset.p
@@ -51,6 +61,9 @@ class DatasetValidator(Experiment, RankAndValidatePipeline):
 
         # validate all subsets
         for n_features_to_select in all_features_to_select:
+            if self._is_plateaued():
+                return
+
             config = self._get_config()
             validator = config.pop("validator")
 
@@ -67,10 +80,31 @@ class DatasetValidator(Experiment, RankAndValidatePipeline):
     def _get_overrides_text(self, estimator):
         return f"[n_features_to_select={estimator.n_features_to_select}] "
 
-    def score(self, X, y, **kwargs) -> Union[Dict, pd.DataFrame, np.generic, None]:
-        scores = super(DatasetValidator, self).score(X, y, **kwargs)
+    def _fit_score_estimator(
+        self, X, y, X_test, y_test, step_number, estimator, **kwargs
+    ) -> Union[Dict, pd.DataFrame, np.generic, None]:
+        scores = super(DatasetValidator, self)._fit_score_estimator(
+            X, y, X_test, y_test, step_number, estimator, **kwargs
+        )
+        self._n_fits += 1
+
+        # keep track of the score curve, to know when to stop early
+        if self.early_stopping:
+            score = float(cast(pd.DataFrame, scores)["score"].iloc[0])
+            if score > self._best_score + self.early_stopping_tol:
+                self._n_stale = 0
+            else:
+                self._n_stale += 1
+            self._best_score = max(self._best_score, score)
+
+        return scores
 
-        # custom metrics
+    def _is_plateaued(self) -> bool:
+        """Whether the validation score did not improve for `early_stopping_patience`
+        subsets in a row."""
+        return self.early_stopping and self._n_stale >= self.early_stopping_patience
+
+    def _score_dataset_metrics(self, scores: Union[Dict, pd.DataFrame]):
         for metric_name, metric_class in self.metrics.items():
             scores_metric = metric_class.score_dataset(scores, self.callbacks)
 
@@ -78,3 +112,27 @@ class DatasetValidator(Experiment, RankAndValidatePipeline):
                 scores = scores_metric
 
         return scores
+
+    def score(self, X, y, **kwargs) -> Union[Dict, pd.DataFrame, np.generic, None]:
+        scores = super(DatasetValidator, self).score(X, y, **kwargs)
+        scores = self._score_dataset_metrics(scores)
+
+        return scores
+
+    def fit_score(
+        self, X, y, X_test, y_test, **kwargs
+    ) -> Union[Dict, pd.DataFrame, np.generic, None]:
+        self._best_score, self._n_stale, self._n_fits = -np.inf, 0, 0
+        scores = super(DatasetValidator, self).fit_score(X, y, X_test, y_test, **kwargs)
+        scores = self._score_dataset_metrics(scores)
+
+        # report how many fits early stopping saved
+        if self._is_plateaued():
+            n_subsets = self._get_n_estimators()
+            self.logger.info(
+                f"validation score plateaued after {self._n_fits} feature subsets: "
+                + f"early stopping saved {n_subsets - self._n_fits}/{n_subsets} fits "
+                + f"(bootstrap_state={self.bootstrap_state})."
+            )
+
+        return scores
@@ -38,7 +38,7 @@ class RankingValidator(Experiment, RankAndValidatePipeline):
 
     @property
     def _cache_filename(self):
-        override = f"bootstrap_state={self.bootstrap_state}"
+        override = f"{self._get_fold_override()}bootstrap_state={self.bootstrap_state}"
         filename = f"ranking[{override}].pickle"
 
         return filename
@@ -1,5 +1,5 @@
 from dataclasses import dataclass
-from typing import Dict, Union, cast
+from typing import Dict, Optional, Tuple, Union, cast
 
 import numpy as np
 import pandas as pd
@@ -8,6 +8,7 @@ from sklearn.feature_selection import SelectFromModel
 
 from fseval.pipeline.estimator import Estimator
 from fseval.types import IncompatibilityError
+from fseval.utils.array_utils import ChunkedArray, IndexedArray
 
 from .._experiment import Experiment
 from ._config import RankAndValidatePipeline
@@ -21,6 +22,7 @@ class SubsetValidator(Experiment, RankAndValidatePipeline):
 
     bootstrap_state: int = MISSING
     n_features_to_select: int = MISSING
+    _checkpoint_scores: Optional[pd.DataFrame] = None
 
     def __post_init__(self):
         if not self.validator.estimates_target:
@@ -47,6 +49,9 @@ class SubsetValidator(Experiment, RankAndValidatePipeline):
                 f"could not resolve feature_importances vector on {estimator.name}."
             )
 
+    def _get_data_shape(self, n: int, p: int) -> Tuple[int, int]:
+        return n, min(p, self.n_features_to_select)
+
     def _prepare_data(self, X, y):
         # select n features: perform feature selection
         selector = SelectFromModel(
@@ -56,32 +61,75 @@ class SubsetValidator(Experiment, RankAndValidatePipeline):
             importance_getter=self._get_feature_importances,
             prefit=True,
         )
-        X = selector.transform(X)
+        # keep lazy views lazy: only select the columns, without reading the data
+        if isinstance(X, (IndexedArray, ChunkedArray)):
+            X = X[:, selector.get_support()]
+        else:
+            X = selector.transform(X)
         return X, y
 
     @property
-    def _cache_filename(self):
-        override = f"bootstrap_state={self.bootstrap_state}"
+    def _overrides(self):
+        override = f"{self._get_fold_override()}bootstrap_state={self.bootstrap_state}"
         override += f",n_features_to_select={self.n_features_to_select}"
-        filename = f"validation[{override}].pickle"
+
+        return override
+
+    @property
+    def _cache_filename(self):
+        filename = f"validation[{self._overrides}].pickle"
+
+        return filename
+
+    @property
+    def _checkpoint_filename(self):
+        filename = f"checkpoint[{self._overrides}].pickle"
 
         return filename
 
     def prefit(self):
+        # when this subset was already scored in a previous run, restore its scores
+        # and skip fitting altogether.
+        if self.checkpoint:
+            self._checkpoint_scores = self.storage.restore_pickle(
+                self._checkpoint_filename
+            )
+            if self._checkpoint_scores is not None:
+                self.logger.debug(f"restored checkpoint {self._checkpoint_filename}")
+                return
+
         self.validator._load_cache(self._cache_filename, self.storage)
 
     def fit(self, X, y):
+        if self._checkpoint_scores is not None:
+            return
+
         super(SubsetValidator, self).fit(X, y)
 
     def postfit(self):
+        if self._checkpoint_scores is not None:
+            return
+
         self.validator._save_cache(self._cache_filename, self.storage)
 
     def score(self, X, y, **kwargs) -> Union[Dict, pd.DataFrame, np.generic, None]:
         """Compute validator score. Uses the `score()` function configured in the
         validator itself. For example, k-NN has a `score()` function that uses the
         `accuracy` score. To customize, override the `score()` function in the
-        validation estimator."""
+        validation estimator. When checkpointing, the scores are saved to storage, such
+        that a rerun can skip this subset."""
+
+        if self._checkpoint_scores is not None:
+            scores = self._checkpoint_scores
+        else:
+            scores = self._score_subset(X, y)
+
+        if self.checkpoint:
+            self.storage.save_pickle(self._checkpoint_filename, scores)
+
+        return scores
 
+    def _score_subset(self, X, y) -> pd.DataFrame:
         # Compute validator score. Uses estimator's `score()` function.
         validator_score = super(SubsetValidator, self).score(X, y)
         assert np.isscalar(validator_score), (
@@ -1,5 +1,5 @@
 from dataclasses import dataclass
-from typing import Dict, Union, cast
+from typing import cast
 
 import numpy as np
 import pandas as pd
@@ -35,14 +35,23 @@ class SupportValidator(SubsetValidator):
     def _cache_filename(self):
         """This function overrides `_cache_filename` in `SubsetValidator`."""
 
-        override = f"bootstrap_state={self.bootstrap_state}"
+        override = f"{self._get_fold_override()}bootstrap_state={self.bootstrap_state}"
         filename = f"support[{override}].pickle"
 
         return filename
 
-    def score(self, X, y, **kwargs) -> Union[Dict, pd.DataFrame, np.generic, None]:
-        # See `SubsetValidator.score()`. This uses the validation estimator's `score()`
-        # function.
+    @property
+    def _checkpoint_filename(self):
+        """This function overrides `_checkpoint_filename` in `SubsetValidator`."""
+
+        override = f"{self._get_fold_override()}bootstrap_state={self.bootstrap_state}"
+        filename = f"checkpoint_support[{override}].pickle"
+
+        return filename
+
+    def _score_subset(self, X, y) -> pd.DataFrame:
+        # See `SubsetValidator._score_subset()`. This uses the validation estimator's
+        # `score()` function.
         # fmt: off
         validator_score = super(SubsetValidator, self).score(X, y)  # lgtm [py/super-not-enclosing-class]
         # fmt: on
@@ -1,6 +1,7 @@
+import multiprocessing
 from dataclasses import dataclass
 from logging import Logger, getLogger
-from typing import Dict, Union, cast
+from typing import Dict, List, Optional, Union, cast
 
 import numpy as np
 import pandas as pd
@@ -8,6 +9,7 @@ from omegaconf import MISSING
 from sklearn.base import clone
 
 from fseval.types import TerminalColor as tc
+from fseval.utils.resource_utils import effective_n_jobs
 
 from .._experiment import Experiment
 from ._config import RankAndValidatePipeline
@@ -50,22 +52,38 @@ class RankAndValidate(Experiment, RankAndValidatePipeline):
             )
             estimators.append(self.support_validator)
 
-        # instantiate dataset validator.
+        # instantiate dataset validator. when memory-lean, early stopping or
+        # checkpointing, the dataset validator fits and scores its feature subsets in
+        # one go: see `fit_score`.
         self.dataset_validator = DatasetValidator(
             **config, validator=clone(validator), bootstrap_state=self.bootstrap_state
         )
-        estimators.append(self.dataset_validator)
+        if not self._is_fit_scoring_subsets():
+            estimators.append(self.dataset_validator)
 
         return estimators
 
+    def _is_memory_lean(self):
+        return self._is_fit_scoring_subsets()
+
     def _prepare_data(self, X, y):
-        # resample dataset: perform a bootstrap
+        # resample dataset: perform a bootstrap. resamples of the same CV split can be
+        # shared between runs, see `ResampleConfig.cache_dir`.
         self.resample.random_state = self.bootstrap_state
+        self.resample.split_key = self.cv.get_split_key()
         X, y = self.resample.transform(X, y)
 
         return X, y
 
     def score(self, X, y, **kwargs) -> Union[Dict, pd.DataFrame, np.generic, None]:
+        # all validators read the ranker, e.g. once for every feature subset: load an
+        # offloaded ranker only once for all of them.
+        with self.ranker._restored():
+            return self._score_validators(X, y, **kwargs)
+
+    def _score_validators(
+        self, X, y, **kwargs
+    ) -> Union[Dict, pd.DataFrame, np.generic, None]:
         scores = {}
 
         # ranking scores
@@ -81,8 +99,16 @@ class RankAndValidate(Experiment, RankAndValidatePipeline):
             support_scores["bootstrap_state"] = self.bootstrap_state
             scores["support"] = support_scores
 
-        # validation scores
-        validation_scores = self.dataset_validator.score(X, y)
+        # validation scores. memory-lean pipelines score their feature subsets whilst
+        # fitting them: no fitted subsets are kept around to be scored here.
+        validation_scores = kwargs.get("validation_scores")
+        if validation_scores is None and self._is_fit_scoring_subsets():
+            raise ValueError(
+                "memory-lean, early stopping and checkpointing pipelines keep no "
+                + "fitted feature subsets to score: use `fit_score` instead of `fit` and `score`."
+            )
+        elif validation_scores is None:
+            validation_scores = self.dataset_validator.score(X, y)
         validation_scores["bootstrap_state"] = self.bootstrap_state
         scores["validation"] = validation_scores
 
@@ -100,6 +126,28 @@ class RankAndValidate(Experiment, RankAndValidatePipeline):
 
         return scores
 
+    def fit_score(
+        self, X, y, X_test, y_test, **kwargs
+    ) -> Union[Dict, pd.DataFrame, np.generic, None]:
+        """Memory-lean alternative to running `prefit`, `fit`, `postfit` and `score`
+        separately. First fits the ranker, after which every feature subset is fit and
+        scored right away - such that only one fitted validator is kept in memory."""
+
+        # resample dataset only once, then fit ranking- and support validators.
+        X, y = self._prepare_data(X, y)
+        self.prefit()
+        for step_number, estimator in enumerate(self.estimators):
+            self._fit_estimator(X, y, step_number, estimator)
+        self.postfit()
+
+        # fit and score all feature subsets, one at a time.
+        validation_scores = self.dataset_validator.fit_score(X, y, X_test, y_test)
+        scores = self.score(
+            X_test, y_test, validation_scores=validation_scores, **kwargs
+        )
+
+        return scores
+
 
 @dataclass
 class BootstrappedRankAndValidate(Experiment, RankAndValidatePipeline):
@@ -108,28 +156,63 @@ class BootstrappedRankAndValidate(Experiment, RankAndValidatePipeline):
     that various metrics can be better approximated."""
 
     logger: Logger = getLogger(__name__)
+    _bootstrap_states: Optional[np.ndarray] = None
 
     def _get_n_jobs(self):
         """Allow each bootstrap experiment to run on a separate CPU."""
 
         return self.n_jobs
 
+    def _get_backend(self):
+        return self.backend
+
+    def _get_cluster_address(self):
+        return self.cluster_address
+
+    def _get_scheduler(self):
+        return self.scheduler
+
+    def _is_streaming(self):
+        """Construct, fit and score each bootstrap on-the-fly when streaming."""
+
+        return self.streaming or self._is_fit_scoring_subsets() or self._is_adaptive()
+
+    def _is_adaptive(self):
+        """Run bootstraps until the validation scores converged."""
+
+        return self.bootstrap_ci_width is not None
+
+    def _get_n_estimators(self):
+        return self.n_bootstraps
+
+    def _is_offloading(self):
+        return self.offload_fitted
+
+    def _get_bootstrap_states(self) -> np.ndarray:
+        if self._bootstrap_states is not None:
+            return self._bootstrap_states
+        else:
+            return np.arange(1, self.n_bootstraps + 1)
+
     def _get_estimator(self):
-        for bootstrap_state in np.arange(1, self.n_bootstraps + 1):
+        for bootstrap_state in self._get_bootstrap_states():
             config = self._get_config()
             ranker = config.pop("ranker")
+            resample = config.pop("resample")
 
+            # clone stateful components, such that bootstraps can safely run in
+            # separate threads.
             yield RankAndValidate(
                 **config,
                 ranker=clone(ranker),
+                resample=clone(resample),
                 bootstrap_state=bootstrap_state,
             )
 
     def _get_overrides_text(self, estimator):
         return f"[bootstrap_state={estimator.bootstrap_state}] "
 
-    def score(self, X, y, **kwargs) -> Union[Dict, pd.DataFrame, np.generic, None]:
-        scores = super(BootstrappedRankAndValidate, self).score(X, y, **kwargs)
+    def _score_bootstrap_metrics(self, scores: Union[Dict, pd.DataFrame]) -> Dict:
         assert isinstance(
             scores, Dict
         ), "Scores returned from `rank_and_validate` (the pipeline) must be dict's."
@@ -145,3 +228,90 @@ class BootstrappedRankAndValidate(Experiment, RankAndValidatePipeline):
                 scores = scores_metric
 
         return scores
+
+    def score(self, X, y, **kwargs) -> Union[Dict, pd.DataFrame, np.generic, None]:
+        scores = super(BootstrappedRankAndValidate, self).score(X, y, **kwargs)
+        scores = self._score_bootstrap_metrics(scores)
+
+        return scores
+
+    def _get_score_sums(self, validation_scores: pd.DataFrame) -> pd.DataFrame:
+        """Count, sum and sum of squares of the validation scores, per feature subset.
+        Sums of successive rounds can be added up, to get the sums over all rounds."""
+        scores = validation_scores["score"].astype(float)
+        sums = pd.DataFrame(
+            {
+                "n_features_to_select": validation_scores["n_features_to_select"],
+                "count": scores.notna().astype(int),
+                "sum": scores.fillna(0.0),
+                "sum_of_squares": scores.fillna(0.0) ** 2,
+            }
+        )
+
+        return sums.groupby("n_features_to_select").sum()
+
+    def _get_ci_width(self, score_sums: pd.DataFrame) -> float:
+        """Width of the 95% confidence interval of the mean validation score, using a
+        normal approximation. The widest interval over all feature subsets."""
+        count = score_sums["count"]
+        variance = (score_sums["sum_of_squares"] - score_sums["sum"] ** 2 / count) / (
+            count - 1
+        )
+        ci_widths = 2 * 1.96 * np.sqrt(variance.clip(lower=0)) / np.sqrt(count)
+
+        return float(ci_widths.max())
+
+    def _adaptive_fit_score(self, X, y, X_test, y_test, **kwargs) -> Dict:
+        """Runs bootstraps in rounds until the confidence interval of the validation
+        scores is narrow enough, or until `n_bootstraps` bootstraps were run. Only
+        running sums of the validation scores are kept to check for convergence: the
+        scores of all rounds are aggregated once, at the end."""
+        target = cast(float, self.bootstrap_ci_width)
+        round_size = effective_n_jobs(self.n_jobs, multiprocessing.cpu_count())
+        rounds_scores: List = []
+        score_sums: Optional[pd.DataFrame] = None
+
+        start, ci_width = 1, np.inf
+        try:
+            while start <= self.n_bootstraps and ci_width > target:
+                # at least two bootstraps are needed to estimate the variance
+                size = max(round_size, 2) if start == 1 else round_size
+                stop = min(start + size, self.n_bootstraps + 1)
+                self._bootstrap_states = np.arange(start, stop)
+                round_scores = super(BootstrappedRankAndValidate, self).fit_score(
+                    X, y, X_test, y_test, **kwargs
+                )
+                rounds_scores.append(round_scores)
+                start = stop
+
+                round_sums = self._get_score_sums(round_scores["validation"])
+                score_sums = (
+                    round_sums
+                    if score_sums is None
+                    else score_sums.add(round_sums, fill_value=0)
+                )
+                ci_width = self._get_ci_width(score_sums)
+        finally:
+            self._bootstrap_states = None
+
+        # report convergence
+        status = tc.green("converged") if ci_width <= target else "did not converge"
+        self.logger.info(
+            f"validation scores {status} after {start - 1}/{self.n_bootstraps} "
+            + f"bootstraps (CI width {ci_width:.4f}, target {target})."
+        )
+
+        return self._aggregate_scores(rounds_scores)
+
+    def fit_score(
+        self, X, y, X_test, y_test, **kwargs
+    ) -> Union[Dict, pd.DataFrame, np.generic, None]:
+        if self._is_adaptive():
+            scores = self._adaptive_fit_score(X, y, X_test, y_test, **kwargs)
+        else:
+            scores = super(BootstrappedRankAndValidate, self).fit_score(
+                X, y, X_test, y_test, **kwargs
+            )
+        scores = self._score_bootstrap_metrics(scores)
+
+        return scores
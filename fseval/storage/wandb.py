@@ -3,10 +3,9 @@ from logging import Logger, getLogger
 from os import path
 from typing import Any, Callable
 
-import wandb
-
 from fseval.config.storage import WandbStorageConfig
 from fseval.types import TerminalColor
+from fseval.utils.import_utils import import_optional
 
 from .local import LocalStorage
 
@@ -15,7 +14,12 @@ from .local import LocalStorage
 class WandbStorage(LocalStorage, WandbStorageConfig):
     logger: Logger = getLogger(__name__)
 
+    def __post_init__(self):
+        # import wandb only when the storage is used: it is slow to import.
+        import_optional("wandb")
+
     def _assert_wandb_available(self):
+        wandb = import_optional("wandb")
         assert wandb.run is not None, (
             "`wandb.run` is not available in this process. this can be because either: "
             + "(1) the wandb callback is not enabled. enable it by setting "
@@ -26,6 +30,7 @@ class WandbStorage(LocalStorage, WandbStorageConfig):
         )
 
     def _get_wandb_run_path(self) -> str:
+        wandb = import_optional("wandb")
         entity: str = self.entity or wandb.run.entity  # type: ignore
         project: str = self.project or wandb.run.project  # type: ignore
         run_id: str = self.run_id or wandb.run.id  # type: ignore
@@ -34,6 +39,7 @@ class WandbStorage(LocalStorage, WandbStorageConfig):
         return run_path
 
     def _get_wandb_load_dir(self) -> str:
+        wandb = import_optional("wandb")
         self._assert_wandb_available()
 
         # (1) run was resumed: use last run's local dir.
@@ -82,6 +88,7 @@ class WandbStorage(LocalStorage, WandbStorageConfig):
         return path.abspath(load_dir)
 
     def _get_wandb_save_dir(self) -> str:
+        wandb = import_optional("wandb")
         self._assert_wandb_available()
 
         # for saving, always use the current run dir.
@@ -105,6 +112,7 @@ class WandbStorage(LocalStorage, WandbStorageConfig):
         super(WandbStorage, self).save(filename, writer, mode)
 
         # save to wandb
+        wandb = import_optional("wandb")
         wandb.save(filename, policy=self.save_policy)  # type: ignore
         self.logger.info(
             f"uploaded {TerminalColor.blue(filename)} to "
@@ -114,6 +122,7 @@ class WandbStorage(LocalStorage, WandbStorageConfig):
 
     def _restore_from_wandb(self, filename: str):
         try:
+            wandb = import_optional("wandb")
             run_path = self._get_wandb_run_path()
             file_handle = wandb.restore(filename, run_path=run_path)
 
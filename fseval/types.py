@@ -1,6 +1,6 @@
 from abc import ABC, abstractmethod
 from enum import Enum
-from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
 
 import numpy as np
 import pandas as pd
@@ -56,6 +56,16 @@ class AbstractAdapter(ABC, BaseEstimator):
         ...
 
 
+class AbstractChunkedAdapter(ABC, BaseEstimator):
+    """Adapter for datasets that cannot be held in memory. Streams the dataset in row
+    chunks instead: every call to `get_chunks` must yield the same chunks, in the same
+    order. Estimators are then fit chunk by chunk, using `partial_fit`."""
+
+    @abstractmethod
+    def get_chunks(self) -> Iterator[Tuple[Any, Any]]:
+        ...
+
+
 class Callback(ABC):
     def on_begin(self, config: DictConfig):
         ...
@@ -107,10 +117,20 @@ class AbstractPipeline(AbstractEstimator, ABC):
     def prefit(self):
         ...
 
+    @abstractmethod
+    def reset(self):
+        ...
+
     @abstractmethod
     def postfit(self):
         ...
 
+    @abstractmethod
+    def fit_score(
+        self, X, y, X_test, y_test, **kwargs
+    ) -> Union[Dict, pd.DataFrame, np.generic, None]:
+        ...
+
 
 class TerminalColor:
     @staticmethod
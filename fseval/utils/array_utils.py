@@ -0,0 +1,233 @@
+import mmap
+from typing import Any, Callable, Iterator, Optional, Tuple
+
+import numpy as np
+
+
+def _compose(index: Any, positions: Optional[np.ndarray], size: int):
+    """Composes an index with the positions selected so far. `None` means all
+    positions are selected, which avoids allocating indices for full axes."""
+    if isinstance(index, slice) and index == slice(None):
+        return positions
+
+    positions = np.arange(size) if positions is None else positions
+    return positions[index]
+
+
+def _expand_index(index: Any) -> Tuple[Any, Any]:
+    """Expands an index into a `(rows, columns)` tuple, e.g. `X[rows, ...]` becomes
+    `X[rows, :]`."""
+    index = index if isinstance(index, tuple) else (index,)
+
+    # expand an ellipsis, and select all remaining axes
+    if any(i is Ellipsis for i in index):
+        position = [i is Ellipsis for i in index].index(True)
+        fill = (slice(None),) * (3 - len(index))
+        index = index[:position] + fill + index[position + 1 :]
+    index = index + (slice(None),) * (2 - len(index))
+    assert len(index) == 2, f"too many indices for a 2-dimensional array: {index}"
+
+    return index[0], index[1]
+
+
+def _open_memmap(filename: str, dtype: np.dtype, shape: Tuple, offset: int, order: str):
+    return np.memmap(
+        filename, dtype=dtype, mode="r", shape=shape, offset=offset, order=order
+    )
+
+
+class IndexedArray:
+    """A lazy view on the rows and columns of a 2-dimensional array, e.g. an
+    `np.memmap`. Indexing composes the indices instead of copying the data, so CV
+    splits, bootstrap resamples and feature subsets are cheap. The selected rows and
+    columns are only read once the view is converted into a numpy array, i.e. once an
+    estimator calls `np.asarray`.
+
+    When the array is a memory-map, pickling the view only pickles the indices and a
+    reference to the file, so views can be sent to other processes cheaply."""
+
+    def __init__(
+        self,
+        array: Any,
+        rows: Optional[np.ndarray] = None,
+        columns: Optional[np.ndarray] = None,
+    ):
+        assert np.ndim(array) == 2, "only 2-dimensional arrays can be indexed lazily."
+        self.array = array
+        self.rows = rows
+        self.columns = columns
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        n, p = self.array.shape
+        n = n if self.rows is None else len(self.rows)
+        p = p if self.columns is None else len(self.columns)
+
+        return int(n), int(p)
+
+    @property
+    def ndim(self) -> int:
+        return 2
+
+    @property
+    def dtype(self) -> np.dtype:
+        return self.array.dtype
+
+    def __len__(self) -> int:
+        return self.shape[0]
+
+    def __repr__(self) -> str:
+        n, p = self.shape
+        return f"IndexedArray(shape=({n}, {p}), dtype={self.dtype})"
+
+    def __getitem__(self, index) -> Any:
+        index = _expand_index(index)
+
+        # scalar indices select a single row or column: read it immediately
+        scalar_axes = tuple(
+            axis for axis, i in enumerate(index) if isinstance(i, (int, np.integer))
+        )
+        rows, columns = ([i] if isinstance(i, (int, np.integer)) else i for i in index)
+        n, p = self.array.shape
+        view = IndexedArray(
+            self.array,
+            _compose(rows, self.rows, n),
+            _compose(columns, self.columns, p),
+        )
+
+        if scalar_axes:
+            return np.asarray(view).squeeze(axis=scalar_axes)
+        else:
+            return view
+
+    def __array__(self, dtype=None, copy=None) -> np.ndarray:
+        if self.rows is not None and self.columns is not None:
+            array = self.array[np.ix_(self.rows, self.columns)]
+        elif self.rows is not None:
+            array = self.array[self.rows]
+        elif self.columns is not None:
+            array = self.array[:, self.columns]
+        else:
+            array = self.array
+
+        return np.array(array, dtype=dtype)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+
+        # only pickle a reference to memory-mapped files, instead of their contents
+        array = self.array
+        if isinstance(array, np.memmap) and isinstance(array.base, mmap.mmap):
+            order = (
+                "F"
+                if array.flags.f_contiguous and not array.flags.c_contiguous
+                else "C"
+            )
+            state["array"] = (
+                array.filename,
+                array.dtype,
+                array.shape,
+                array.offset,
+                order,
+            )
+            state["_memmap"] = True
+
+        return state
+
+    def __setstate__(self, state):
+        if state.pop("_memmap", False):
+            state["array"] = _open_memmap(*state["array"])
+
+        self.__dict__.update(state)
+
+
+class ChunkedArray:
+    """A 2-dimensional array that is streamed in row chunks, e.g. by an
+    `AbstractChunkedAdapter`, instead of being held in memory. Like `IndexedArray`,
+    indexing selects rows and columns lazily. Rows are selected by their multiplicity,
+    such that bootstrap resamples can select rows more than once: rows are always
+    streamed in their original order. The array cannot be converted into a numpy
+    array, so estimators have to be fit chunk by chunk, using `iter_chunks`."""
+
+    def __init__(
+        self,
+        get_chunks: Callable[[], Iterator[Tuple[Any, Any]]],
+        n: int,
+        p: int,
+        counts: Optional[np.ndarray] = None,
+        columns: Optional[np.ndarray] = None,
+    ):
+        self.get_chunks = get_chunks
+        self.n = n
+        self.p = p
+        self.counts = counts
+        self.columns = columns
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        n = self.n if self.counts is None else self.counts.sum()
+        p = self.p if self.columns is None else len(self.columns)
+
+        return int(n), int(p)
+
+    @property
+    def ndim(self) -> int:
+        return 2
+
+    def __len__(self) -> int:
+        return self.shape[0]
+
+    def __repr__(self) -> str:
+        n, p = self.shape
+        return f"ChunkedArray(shape=({n}, {p}))"
+
+    def __getitem__(self, index) -> "ChunkedArray":
+        rows, columns = _expand_index(index)
+        assert not isinstance(
+            rows, (int, np.integer)
+        ), "chunked arrays do not support selecting a single row."
+
+        counts = self.counts
+        if not (isinstance(rows, slice) and rows == slice(None)):
+            # positions of the rows in the current selection, in streaming order
+            positions = (
+                np.arange(self.n)
+                if self.counts is None
+                else np.repeat(np.arange(self.n), self.counts)
+            )
+            counts = np.bincount(positions[rows], minlength=self.n)
+
+        return ChunkedArray(
+            self.get_chunks,
+            self.n,
+            self.p,
+            counts,
+            _compose(columns, self.columns, self.p),
+        )
+
+    def iter_chunks(self) -> Iterator[Tuple[Any, np.ndarray]]:
+        """Yields the selected rows and columns, chunk by chunk, as `(X, y)` tuples.
+        Chunks from which no rows are selected are skipped."""
+        offset = 0
+        for X_chunk, y_chunk in self.get_chunks():
+            size = X_chunk.shape[0]
+            y_chunk = np.asarray(y_chunk)
+
+            if self.counts is not None:
+                chunk_counts = self.counts[offset : offset + size]
+                offset += size
+                if not chunk_counts.any():
+                    continue
+
+                rows = np.repeat(np.arange(size), chunk_counts)
+                X_chunk, y_chunk = X_chunk[rows], y_chunk[rows]
+            if self.columns is not None:
+                X_chunk = X_chunk[:, self.columns]
+
+            yield X_chunk, y_chunk
+
+    def __array__(self, dtype=None, copy=None):
+        raise TypeError(
+            "a chunked array cannot be converted into a numpy array: "
+            + "estimators must be fit chunk by chunk, using `partial_fit`."
+        )
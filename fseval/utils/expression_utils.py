@@ -0,0 +1,147 @@
+import ast
+import sys
+from functools import lru_cache
+from types import CodeType
+from typing import Callable, Dict, Iterable, List, Tuple
+
+import numpy as np
+
+
+def _rounded_grid(values: Iterable) -> List[int]:
+    """Rounds the values to integers, dropping duplicates but keeping their order."""
+    return list(dict.fromkeys(int(round(value)) for value in values))
+
+
+def linspace(start: float, stop: float, num: int) -> List[int]:
+    """`num` linearly spaced integers between `start` and `stop`, inclusive.
+    Integers that occur more than once after rounding are only included once."""
+    return _rounded_grid(np.linspace(start, stop, num))
+
+
+def geomspace(start: float, stop: float, num: int) -> List[int]:
+    """`num` geometrically spaced integers between `start` and `stop`, inclusive.
+    Integers that occur more than once after rounding are only included once."""
+    return _rounded_grid(np.geomspace(start, stop, num))
+
+
+# functions available in grid expressions
+FUNCTIONS: Dict[str, Callable] = {
+    "range": range,
+    "min": min,
+    "max": max,
+    "int": int,
+    "float": float,
+    "round": round,
+    "abs": abs,
+    "len": len,
+    "sum": sum,
+    "list": list,
+    "sorted": sorted,
+    "set": set,
+    "linspace": linspace,
+    "geomspace": geomspace,
+}
+
+# syntax allowed in grid expressions: arithmetic, comparisons, function calls,
+# literals, subscripts and comprehensions. notably, attribute access is not allowed.
+ALLOWED_NODES: Tuple = (
+    ast.Expression,
+    ast.Constant,
+    ast.Name,
+    ast.Load,
+    ast.Store,
+    ast.Call,
+    ast.keyword,
+    ast.BinOp,
+    ast.UnaryOp,
+    ast.BoolOp,
+    ast.Compare,
+    ast.IfExp,
+    ast.operator,
+    ast.unaryop,
+    ast.boolop,
+    ast.cmpop,
+    ast.List,
+    ast.Tuple,
+    ast.Set,
+    ast.Subscript,
+    ast.Slice,
+    ast.ListComp,
+    ast.SetComp,
+    ast.GeneratorExp,
+    ast.comprehension,
+)
+
+# node types that `ast.parse` produces on older python versions: literals before
+# python 3.8, and subscript indices before python 3.9. deprecated since.
+if sys.version_info < (3, 9):
+    ALLOWED_NODES += tuple(
+        node_type
+        for node_type in (
+            getattr(ast, "Num", None),
+            getattr(ast, "Str", None),
+            getattr(ast, "Bytes", None),
+            getattr(ast, "NameConstant", None),
+            getattr(ast, "Ellipsis", None),
+            getattr(ast, "Index", None),
+            getattr(ast, "ExtSlice", None),
+        )
+        if node_type is not None
+    )
+
+
+@lru_cache(maxsize=None)
+def compile_expression(expression: str, variables: Tuple[str, ...]) -> CodeType:
+    """Parses and compiles an expression, after checking that it only uses safe
+    syntax: see `ALLOWED_NODES`. Names must either be one of `variables`, a function
+    in `FUNCTIONS` or a comprehension variable. Raises a `ValueError` otherwise."""
+    tree = ast.parse(expression.strip(), mode="eval")
+
+    # comprehension variables, e.g. `f` in `[int(f * p) for f in (0.1, 0.5)]`
+    local_names = {
+        node.id
+        for comprehension in ast.walk(tree)
+        if isinstance(comprehension, ast.comprehension)
+        for node in ast.walk(comprehension.target)
+        if isinstance(node, ast.Name)
+    }
+
+    for node in ast.walk(tree):
+        if not isinstance(node, ALLOWED_NODES):
+            raise ValueError(
+                f"`{type(node).__name__}` is not allowed in expression: {expression}"
+            )
+        if isinstance(node, ast.Name) and not (
+            node.id in variables or node.id in FUNCTIONS or node.id in local_names
+        ):
+            raise ValueError(f"unknown name `{node.id}` in expression: {expression}")
+
+    return compile(tree, filename="<expression>", mode="eval")
+
+
+def evaluate_expression(expression: str, **variables) -> object:
+    """Evaluates an expression in a sandbox: only the given variables and the
+    functions in `FUNCTIONS` are available. The compiled expression is cached."""
+    code = compile_expression(expression, tuple(sorted(variables.keys())))
+    namespace = {"__builtins__": {}, **FUNCTIONS, **variables}
+
+    return eval(code, namespace)
+
+
+@lru_cache(maxsize=32)
+def evaluate_subset_grid(expression: str, n: int, p: int) -> Tuple[int, ...]:
+    """Evaluates a feature subset grid, like `range(1, min(50, p) + 1)`, given the
+    amount of samples `n` and features `p`. The grid is kept as-is, in order and
+    including duplicates; raises a `ValueError` on values that are not integral. The
+    result is cached: all bootstraps share one grid."""
+    grid = evaluate_expression(expression, n=n, p=p)
+    assert isinstance(grid, Iterable), f"expression must be iterable: {expression}"
+
+    grid = list(grid)
+    for value in grid:
+        if not float(value).is_integer():
+            raise ValueError(
+                f"subset grid must contain integers, got `{value}`: {expression}"
+            )
+
+    return tuple(int(value) for value in grid)
@@ -0,0 +1,73 @@
+import hashlib
+import pickle
+from typing import Any, Iterator, Optional
+
+import numpy as np
+from scipy import sparse
+
+from fseval.utils.array_utils import ChunkedArray, IndexedArray
+
+# amount of bytes hashed at once
+BLOCK_SIZE: int = 2**20
+
+
+def _iter_blocks(array: np.ndarray, max_blocks: Optional[int]) -> Iterator[Any]:
+    """Yields the array buffer in blocks of rows of about `BLOCK_SIZE` bytes each. When
+    `max_blocks` is given, only that many blocks are yielded, evenly spaced across the
+    array. Blocks are only copied when the array is not C-contiguous."""
+    n = len(array)
+    row_size = max(1, array[:1].nbytes)
+    rows_per_block = max(1, BLOCK_SIZE // row_size)
+    n_blocks = -(-n // rows_per_block)
+
+    blocks = np.arange(n_blocks)
+    if max_blocks is not None and max_blocks < n_blocks:
+        blocks = np.unique(np.linspace(0, n_blocks - 1, max_blocks).round().astype(int))
+
+    for block in blocks:
+        start = block * rows_per_block
+        rows = np.ascontiguousarray(array[start : start + rows_per_block])
+        yield memoryview(rows).cast("B")
+
+
+def _update(hasher: Any, array: Any, max_blocks: Optional[int]):
+    if isinstance(array, IndexedArray):
+        _update(hasher, array.array, max_blocks)
+        for index in [array.rows, array.columns]:
+            if index is not None:
+                _update(hasher, index, None)
+    elif isinstance(array, ChunkedArray):
+        for X_chunk, y_chunk in array.iter_chunks():
+            _update(hasher, X_chunk, max_blocks)
+            _update(hasher, y_chunk, max_blocks)
+    elif sparse.issparse(array):
+        array = array.tocsr()
+        hasher.update(f"csr{array.shape}".encode())
+        for component in [array.data, array.indices, array.indptr]:
+            _update(hasher, component, max_blocks)
+    else:
+        array = np.asarray(array)
+        hasher.update(f"{array.dtype.str}{array.shape}".encode())
+
+        # python objects have no buffer to hash
+        if array.dtype.hasobject:
+            hasher.update(pickle.dumps(array.tolist()))
+        elif array.ndim == 0:
+            hasher.update(array.tobytes())
+        else:
+            for block in _iter_blocks(array, max_blocks):
+                hasher.update(block)
+
+
+def fingerprint(*arrays: Any, max_blocks: Optional[int] = None) -> str:
+    """Fingerprints arrays using a block-wise BLAKE2 hash of their buffers. Hashing
+    runs in C, block by block, so large and memory-mapped arrays are never copied as a
+    whole. The shape and dtype are included in the hash. To fingerprint very large
+    arrays quickly, only `max_blocks` blocks of each array can be hashed, evenly
+    sampled across the array. Supports numpy arrays, sparse matrices, and
+    `IndexedArray` and `ChunkedArray` views."""
+    hasher = hashlib.blake2b(digest_size=16)
+    for array in arrays:
+        _update(hasher, array, max_blocks)
+
+    return hasher.hexdigest()
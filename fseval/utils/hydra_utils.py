@@ -1,9 +1,11 @@
-from typing import Callable, List, Optional, Tuple
+import itertools
+from typing import Callable, Dict, List, Optional, Tuple
 
 from hydra import compose, initialize_config_module
 from hydra.core.config_loader import ConfigLoader
 from hydra.core.global_hydra import GlobalHydra
 from hydra.core.object_type import ObjectType
+from hydra.core.override_parser.overrides_parser import OverridesParser
 
 from fseval.config import PipelineConfig
 
@@ -26,12 +28,12 @@ def _ensure_hydra_initialized(
 
 
 def get_config(
-    config_module: str, config_name: str, overrides: List[str] = []
+    config_module: str, config_name: str, overrides: Optional[List[str]] = None
 ) -> PipelineConfig:
     """Gets the fseval configuration as composed by Hydra. Local .yaml configuration
     and defaults are automatically merged."""
     _ensure_hydra_initialized(config_module)
-    config = compose(config_name=config_name, overrides=overrides)
+    config = compose(config_name=config_name, overrides=overrides or [])
     return config  # type: ignore
 
 
@@ -43,6 +45,43 @@ def _get_config_loader(config_module: str) -> ConfigLoader:
     return cl
 
 
+def get_sweep_overrides(config_module: str, overrides: List[str]) -> List[List[str]]:
+    """Expands sweep overrides, like `ranker=chi2,anova validator=knn`, into the
+    overrides of every job in the sweep: the cartesian product of all sweeps, like
+    Hydra's basic sweeper. Supports sweeps such as `range(0,5)` and `glob(*)`."""
+    cl = _get_config_loader(config_module)
+    parser = OverridesParser.create(config_loader=cl)
+
+    # the options of every key. a later override of the same key replaces it. only
+    # sweeps are rewritten: other overrides, like `~key` or `++key=v`, are kept as-is.
+    options: Dict[str, List[str]] = {}
+    for override in parser.parse_overrides(overrides):
+        key = override.get_key_element()
+        if not override.is_sweep_override():
+            options[key] = [str(override.input_line)]
+        elif override.is_discrete_sweep():
+            options[key] = [f"{key}={v}" for v in override.sweep_string_iterator()]
+        else:
+            raise ValueError(
+                f"only discrete sweeps are supported, like `{key}=a,b`: {override}"
+            )
+
+    return [list(job) for job in itertools.product(*options.values())]
+
+
+def get_sweep_configs(
+    config_module: str, config_name: str, overrides: Optional[List[str]] = None
+) -> Tuple[List[PipelineConfig], List[List[str]]]:
+    """Composes the configs of all jobs in a sweep up front. Hydra is initialized only
+    once for the whole sweep. Returns the configs and the overrides of every job."""
+    job_overrides = get_sweep_overrides(config_module, overrides or [])
+    configs = [
+        get_config(config_module, config_name, overrides=list(job))
+        for job in job_overrides
+    ]
+    return configs, job_overrides
+
+
 def get_group_options(
     config_module: str,
     group_name: str,
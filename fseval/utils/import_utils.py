@@ -0,0 +1,17 @@
+import importlib
+from types import ModuleType
+from typing import Optional
+
+
+def import_optional(name: str, package: Optional[str] = None) -> ModuleType:
+    """Imports a heavy or optional dependency, like `wandb`, only once it is used, so
+    that importing fseval stays fast. Modules are cached by Python after their first
+    import, so calling this repeatedly is cheap. Raises an `ImportError` that tells
+    which `package` to install when the module is not available."""
+    try:
+        return importlib.import_module(name)
+    except ImportError as e:
+        raise ImportError(
+            f"`{name}` is required for this feature: "
+            + f"`pip install {package or name.split('.')[0]}`."
+        ) from e
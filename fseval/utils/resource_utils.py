@@ -0,0 +1,92 @@
+import multiprocessing
+from logging import getLogger
+from typing import Any, List, Optional, Tuple
+
+from omegaconf import DictConfig
+
+# estimator parameters that control the amount of threads an estimator uses, e.g.
+# scikit-learn & LightGBM (`n_jobs`), XGBoost (`nthread`) and CatBoost (`thread_count`).
+THREAD_PARAMS: List[str] = ["n_jobs", "n_threads", "nthread", "thread_count"]
+
+
+def effective_n_jobs(n_jobs: Optional[int], cpu_count: int) -> int:
+    """Amount of CPU's a `n_jobs` parameter resolves to, following joblib semantics:
+    `None` means 1 and negative values count back from `cpu_count`, i.e. -1 means
+    all CPU's."""
+    if n_jobs is None or n_jobs == 0:
+        return 1
+    elif n_jobs < 0:
+        return max(1, cpu_count + 1 + n_jobs)
+    else:
+        return min(n_jobs, cpu_count)
+
+
+def get_estimator_threads(estimator: Any, cpu_count: int) -> int:
+    """Amount of threads an estimator config requests, i.e. the largest of its
+    thread parameters. Is 1 if the estimator configures none of them."""
+    if not isinstance(estimator, (dict, DictConfig)):
+        return 1
+
+    threads = [
+        effective_n_jobs(estimator.get(param), cpu_count)
+        for param in THREAD_PARAMS
+        if param in estimator
+    ]
+    return max(threads, default=1)
+
+
+def plan_resources(
+    n_jobs: Optional[int], n_tasks: int, estimator_threads: int, cpu_count: int
+) -> Tuple[int, int]:
+    """Splits the CPU budget between outer workers and inner estimator threads. The
+    outer workers get precedence, since bootstraps parallelize perfectly; but there
+    are never more workers than tasks. The inner threads get the remaining CPU's.
+
+    Returns:
+        outer (int): Amount of outer workers, i.e. bootstraps run in parallel.
+        inner (int): Amount of threads each estimator is allowed to use.
+    """
+    outer = min(effective_n_jobs(n_jobs, cpu_count), max(1, n_tasks))
+    inner = min(estimator_threads, max(1, cpu_count // outer))
+
+    return outer, inner
+
+
+def coordinate_n_jobs(cfg: Any, cpu_count: Optional[int] = None) -> None:
+    """Prevents oversubscription: when both the pipeline `n_jobs` and the thread
+    parameters of the ranker or validator are set, e.g. both to -1, cpu_count²
+    threads would be spawned. In that case, the CPU budget is split between the
+    outer bootstrap workers and the inner estimator threads. Modifies `cfg` in-place.
+    """
+    logger = getLogger(__name__)
+    cpu_count = cpu_count or multiprocessing.cpu_count()
+
+    estimators = [
+        cfg[key].get("estimator")
+        for key in ["ranker", "validator"]
+        if cfg.get(key) is not None
+    ]
+    estimator_threads = max(
+        [get_estimator_threads(estimator, cpu_count) for estimator in estimators],
+        default=1,
+    )
+    requested = effective_n_jobs(cfg.get("n_jobs"), cpu_count) * estimator_threads
+    if requested <= cpu_count:
+        return
+
+    outer, inner = plan_resources(
+        cfg.get("n_jobs"), cfg.get("n_bootstraps", 1), estimator_threads, cpu_count
+    )
+    logger.info(
+        f"{requested} threads requested on {cpu_count} CPU's: using "
+        + f"n_jobs={outer} for the pipeline and {inner} thread(s) per estimator."
+    )
+
+    if cfg.get("n_jobs") is not None:
+        cfg.n_jobs = outer
+    for estimator in estimators:
+        if not isinstance(estimator, (dict, DictConfig)):
+            continue
+        for param in THREAD_PARAMS:
+            if param in estimator:
+                estimator[param] = inner
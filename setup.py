@@ -33,6 +33,9 @@ with open("README.md", mode="r", encoding="utf8") as fh:
             "numpy>=1.19",
             "pandas>=1.1",
             "scikit-learn>=0.24",
+            "scipy>=1.5",
+            "joblib>=1.0",
+            "threadpoolctl>=2",
             "humanfriendly>=9",
             "shortuuid>=1.0",
             "overrides>=6",
@@ -1,4 +1,4 @@
-from typing import Dict, List, Tuple, Union, cast
+from typing import Dict, Iterator, List, Tuple, Union, cast
 
 import numpy as np
 import pandas as pd
@@ -11,12 +11,20 @@ from fseval.config import (
     ResampleConfig,
 )
 from fseval.pipeline.dataset import Dataset, DatasetLoader
-from fseval.types import AbstractAdapter, Task
+from fseval.pipelines._experiment import Experiment
+from fseval.pipelines.rank_and_validate._subset_validator import SubsetValidator
+from fseval.pipelines.rank_and_validate.rank_and_validate import (
+    BootstrappedRankAndValidate,
+)
+from fseval.storage.local import LocalStorage
+from fseval.types import AbstractAdapter, AbstractChunkedAdapter, Task
+from fseval.utils.array_utils import IndexedArray
 from fseval.utils.hydra_utils import get_config
 from hydra.core.config_store import ConfigStore
 from hydra.errors import InstantiationException
 from hydra.utils import instantiate
 from omegaconf import DictConfig, open_dict
+from scipy import sparse
 from sklearn.base import BaseEstimator
 
 cs = ConfigStore.instance()
@@ -31,7 +39,7 @@ class RandomEstimator(BaseEstimator):
         return np.random.RandomState(self.random_state)
 
     def fit(self, X, y):
-        n, p = np.asarray(X).shape
+        n, p = np.shape(X)
         self.n_features = p
 
         # random generator
@@ -49,6 +57,13 @@ class RandomEstimator(BaseEstimator):
             self.feature_importances_ = random_state.rand(self.n_features, 3)
             self.ranking_ = random_state.rand(self.n_features, 3)
 
+    def partial_fit(self, X, y, classes=None):
+        self.fit(X, y)
+        return self
+
+    def predict(self, X):
+        return self._get_random_state().randint(0, 2, size=np.shape(X)[0])
+
     def score(self, X, y, **kwargs) -> Union[Dict, pd.DataFrame, np.generic, None]:
         return self._get_random_state().rand()
 
@@ -60,6 +75,19 @@ class MockAdapter(AbstractAdapter):
         return X, y
 
 
+class SparseMockAdapter(AbstractAdapter):
+    def get_data(self) -> Tuple[sparse.csc_matrix, List]:
+        X, y = MockAdapter().get_data()
+        return sparse.csc_matrix(X), y
+
+
+class ChunkedMockAdapter(AbstractChunkedAdapter):
+    def get_chunks(self) -> Iterator[Tuple[np.ndarray, List]]:
+        X, y = MockAdapter().get_data()
+        for i in range(0, len(X), 2):
+            yield np.asarray(X[i : i + 2]), y[i : i + 2]
+
+
 random_estimator = {
     "_target_": "tests.integration.pipelines.test_rank_and_validate.RandomEstimator",
     "random_state": 0,
@@ -142,7 +170,7 @@ def cfg() -> PipelineConfig:
     return cfg
 
 
-def run_pipeline___test_version(cfg: PipelineConfig):
+def load_dataset___test_version(cfg: PipelineConfig) -> Dataset:
     # callback target. requires disabling omegaconf struct.
     with open_dict(cast(DictConfig, cfg)):
         cfg.callbacks[
@@ -155,14 +183,41 @@ def run_pipeline___test_version(cfg: PipelineConfig):
     cfg.dataset.n = dataset.n
     cfg.dataset.p = dataset.p
     cfg.dataset.multioutput = dataset.multioutput
+    cfg.dataset.chunked = dataset.chunked
+    cfg.dataset.fingerprint = dataset.fingerprint
+    cfg.dataset.classes = dataset.classes
+
+    return dataset
+
+
+def run_pipeline___test_version(cfg: PipelineConfig) -> Dict:
+    dataset = load_dataset___test_version(cfg)
 
     # fit pipeline
     pipeline = instantiate(cfg)
     X_train, X_test, y_train, y_test = pipeline.cv.train_test_split(
         dataset.X, dataset.y
     )
-    pipeline.fit(X_train, y_train)
-    pipeline.score(X_test, y_test, feature_importances=dataset.feature_importances)
+    if (
+        cfg.streaming
+        or cfg.memory_lean
+        or cfg.early_stopping
+        or cfg.bootstrap_ci_width is not None
+    ):
+        scores = pipeline.fit_score(
+            X_train,
+            y_train,
+            X_test,
+            y_test,
+            feature_importances=dataset.feature_importances,
+        )
+    else:
+        pipeline.fit(X_train, y_train)
+        scores = pipeline.score(
+            X_test, y_test, feature_importances=dataset.feature_importances
+        )
+
+    return scores
 
 
 def test_without_ranker_gt(cfg: PipelineConfig):
@@ -205,6 +260,443 @@ def test_with_ranker_gt_no_importances_substitution(cfg: PipelineConfig):
     run_pipeline___test_version(cfg)
 
 
+@pytest.fixture
+def cfg_mock_storage() -> PipelineConfig:
+    cfg: PipelineConfig = get_config(
+        config_module="tests.integration.pipelines.conf",
+        config_name="my_test_config",
+        overrides=[
+            "dataset=some_dataset",
+            "cv=simple_shuffle_split",
+            "validator=random_validator",
+            "ranker=random_ranker",
+            "resample=default_resampling",
+            "storage=mock",
+        ],
+    )
+
+    return cfg
+
+
+def test_streaming(cfg_mock_storage: PipelineConfig):
+    """Streaming execution should yield the same scores as running `fit` and `score`
+    as separate sweeps."""
+    cfg = cfg_mock_storage
+    columns = ["n_features_to_select", "score", "bootstrap_state"]
+
+    eager_scores = run_pipeline___test_version(cfg)
+    cfg.streaming = True
+    streaming_scores = run_pipeline___test_version(cfg)
+
+    pd.testing.assert_frame_equal(
+        eager_scores["validation"][columns], streaming_scores["validation"][columns]
+    )
+    assert len(streaming_scores["ranking"]) == cfg.n_bootstraps
+
+
+@pytest.mark.parametrize("backend", ["multiprocessing", "loky", "threading"])
+def test_n_jobs_backend(cfg_mock_storage: PipelineConfig, backend: str):
+    cfg = cfg_mock_storage
+    columns = ["n_features_to_select", "score", "bootstrap_state"]
+
+    sequential_scores = run_pipeline___test_version(cfg)
+    cfg.n_jobs = 2
+    cfg.backend = backend
+    parallel_scores = run_pipeline___test_version(cfg)
+
+    pd.testing.assert_frame_equal(
+        sequential_scores["validation"][columns], parallel_scores["validation"][columns]
+    )
+
+
+@pytest.mark.parametrize("streaming", [False, True])
+def test_dask_local_cluster(cfg_mock_storage: PipelineConfig, streaming: bool):
+    """Bootstraps are shipped to a local in-process dask cluster."""
+    pytest.importorskip("distributed")
+    cfg = cfg_mock_storage
+    columns = ["n_features_to_select", "score", "bootstrap_state"]
+
+    sequential_scores = run_pipeline___test_version(cfg)
+    cfg.streaming = streaming
+    cfg.n_jobs = 2
+    cfg.backend = "dask"
+    distributed_scores = run_pipeline___test_version(cfg)
+
+    pd.testing.assert_frame_equal(
+        sequential_scores["validation"][columns],
+        distributed_scores["validation"][columns],
+    )
+
+
+@pytest.mark.parametrize("backend", ["multiprocessing", "loky", "threading"])
+def test_streaming_n_jobs(cfg_mock_storage: PipelineConfig, backend: str):
+    """Workers fit and score entire bootstraps, only sending back the scores."""
+    cfg = cfg_mock_storage
+    columns = ["n_features_to_select", "score", "bootstrap_state"]
+
+    eager_scores = run_pipeline___test_version(cfg)
+    cfg.streaming = True
+    cfg.n_jobs = 2
+    cfg.backend = backend
+    streaming_scores = run_pipeline___test_version(cfg)
+
+    pd.testing.assert_frame_equal(
+        eager_scores["validation"][columns], streaming_scores["validation"][columns]
+    )
+
+
+def test_bootstraps_isolated(cfg: PipelineConfig):
+    """Each bootstrap owns its stateful components, so bootstraps can run in threads."""
+    load_dataset___test_version(cfg)
+    pipeline = instantiate(cfg)
+    first, second = pipeline.estimators[:2]
+
+    assert first.resample is not second.resample
+    assert first.ranker is not second.ranker
+
+
+@pytest.mark.parametrize("streaming", [False, True])
+def test_cost_aware_scheduler(
+    cfg_mock_storage: PipelineConfig, monkeypatch, streaming: bool
+):
+    cfg = cfg_mock_storage
+    columns = ["n_features_to_select", "score", "bootstrap_state"]
+
+    static_scores = run_pipeline___test_version(cfg)
+    cfg.streaming = streaming
+    cfg.n_jobs = 2
+    cfg.scheduler = "cost_aware"
+
+    # streamed bootstraps are scheduled statically: their costs are not estimated
+    estimate_costs = Experiment._estimate_costs
+    n_estimates = []
+
+    def counting_estimate_costs(self, X, estimators):
+        n_estimates.append(len(estimators))
+        return estimate_costs(self, X, estimators)
+
+    monkeypatch.setattr(Experiment, "_estimate_costs", counting_estimate_costs)
+    cost_aware_scores = run_pipeline___test_version(cfg)
+
+    pd.testing.assert_frame_equal(
+        static_scores["validation"][columns], cost_aware_scores["validation"][columns]
+    )
+    assert (len(n_estimates) == 0) == streaming
+
+
+def test_estimate_costs(cfg: PipelineConfig):
+    """Bootstraps whose ranker was loaded from cache are cheaper to fit."""
+    dataset = load_dataset___test_version(cfg)
+    pipeline = instantiate(cfg)
+    X = np.asarray(dataset.X)
+
+    costs = pipeline._estimate_costs(X, pipeline.estimators)
+    assert costs[0] == costs[1] > 0
+
+    cached_bootstrap = pipeline.estimators[0]
+    cached_bootstrap.ranker._is_fitted = True
+    cached_bootstrap.ranker.fit_time_ = 1.0
+    costs = pipeline._estimate_costs(X, pipeline.estimators)
+    assert costs[0] < costs[1]
+
+
+def run_checkpointed___test_version(cfg: PipelineConfig, load_dir, save_dir) -> Dict:
+    cfg.checkpoint = True
+    cfg.storage.load_dir = load_dir and str(load_dir)
+    cfg.storage.save_dir = str(save_dir)
+    save_dir.mkdir()
+
+    dataset = load_dataset___test_version(cfg)
+    pipeline = instantiate(cfg)
+    X_train, X_test, y_train, y_test = pipeline.cv.train_test_split(
+        dataset.X, dataset.y
+    )
+
+    return pipeline.fit_score(X_train, y_train, X_test, y_test)
+
+
+def test_checkpoint(cfg: PipelineConfig, tmp_path, monkeypatch):
+    """A rerun restores already scored subsets from their checkpoints: nothing is fit
+    or scored again, even though estimator caches exist."""
+    columns = ["n_features_to_select", "score", "bootstrap_state"]
+    run = lambda load_dir, save_dir: run_checkpointed___test_version(
+        cfg, load_dir, save_dir
+    )
+
+    scores = run(None, tmp_path / "run")
+    assert list((tmp_path / "run").glob("checkpoint*.pickle"))
+
+    # rerun, loading from the first run
+    def fail(*args, **kwargs):
+        raise AssertionError("subset was fit or scored again.")
+
+    monkeypatch.setattr(RandomEstimator, "fit", fail)
+    monkeypatch.setattr(RandomEstimator, "score", fail)
+    restored_scores = run(tmp_path / "run", tmp_path / "rerun")
+
+    pd.testing.assert_frame_equal(
+        scores["validation"][columns], restored_scores["validation"][columns]
+    )
+    pd.testing.assert_frame_equal(scores["support"], restored_scores["support"])
+    assert list((tmp_path / "rerun").glob("checkpoint*.pickle"))
+
+
+def test_checkpoint_resume(cfg: PipelineConfig, tmp_path, monkeypatch):
+    """Subsets are checkpointed as soon as they are scored: a rerun of a crashed run
+    resumes where it crashed, and yields the same scores as an uninterrupted run."""
+    columns = ["n_features_to_select", "score", "bootstrap_state"]
+    scores = run_checkpointed___test_version(cfg, None, tmp_path / "uninterrupted")
+
+    # crash whilst fitting the last subset of the first bootstrap
+    fit = SubsetValidator.fit
+
+    def crashing_fit(self, X, y):
+        if self.n_features_to_select == 3:
+            raise RuntimeError("crashed")
+        return fit(self, X, y)
+
+    monkeypatch.setattr(SubsetValidator, "fit", crashing_fit)
+    with pytest.raises(RuntimeError, match="crashed"):
+        run_checkpointed___test_version(cfg, None, tmp_path / "crashed")
+    assert len(list((tmp_path / "crashed").glob("checkpoint[[]*.pickle"))) == 2
+
+    # rerun: only the subsets that were not checkpointed are fit and scored
+    n_scored = []
+    score_subset = SubsetValidator._score_subset
+
+    def counting_score_subset(self, X, y):
+        n_scored.append(self.n_features_to_select)
+        return score_subset(self, X, y)
+
+    monkeypatch.setattr(SubsetValidator, "fit", fit)
+    monkeypatch.setattr(SubsetValidator, "_score_subset", counting_score_subset)
+    resumed_scores = run_checkpointed___test_version(
+        cfg, tmp_path / "crashed", tmp_path / "resumed"
+    )
+
+    assert len(n_scored) == 2 * 3 - 2
+    pd.testing.assert_frame_equal(
+        scores["validation"][columns], resumed_scores["validation"][columns]
+    )
+
+
+def test_early_stopping(cfg_mock_storage: PipelineConfig):
+    """The random validator scores every subset equally: the score curve is flat
+    right away. Validation stops once the patience runs out."""
+    cfg = cfg_mock_storage
+    columns = ["n_features_to_select", "score", "bootstrap_state"]
+
+    eager_scores = run_pipeline___test_version(cfg)
+    cfg.early_stopping = True
+    cfg.early_stopping_patience = 1
+    early_stopped_scores = run_pipeline___test_version(cfg)
+
+    validation = early_stopped_scores["validation"]
+    assert len(validation) == 2 * cfg.n_bootstraps
+    assert list(validation["n_features_to_select"].unique()) == [1, 2]
+
+    # with enough patience, all subsets are validated
+    cfg.early_stopping_patience = 10
+    patient_scores = run_pipeline___test_version(cfg)
+    pd.testing.assert_frame_equal(
+        eager_scores["validation"][columns], patient_scores["validation"][columns]
+    )
+
+
+def test_adaptive_bootstraps(cfg_mock_storage: PipelineConfig):
+    """The random validator scores every bootstrap equally: the confidence interval
+    has zero width after the minimum of two bootstraps."""
+    cfg = cfg_mock_storage
+    cfg.n_bootstraps = 5
+    cfg.bootstrap_ci_width = 0.1
+    scores = run_pipeline___test_version(cfg)
+
+    assert list(scores["validation"]["bootstrap_state"].unique()) == [1, 2]
+    assert len(scores["ranking"]) == 2
+
+    # an unreachable target uses the entire budget
+    cfg.bootstrap_ci_width = -1.0
+    cfg.n_jobs = 2
+    scores = run_pipeline___test_version(cfg)
+
+    assert len(scores["ranking"]) == 5
+
+
+def test_ci_width_running_sums():
+    """The CI width from running sums of several rounds equals the CI width over the
+    validation scores of all rounds."""
+    rng = np.random.default_rng(0)
+    validation_scores = pd.DataFrame(
+        {"n_features_to_select": np.repeat([1, 2, 3], 10), "score": rng.random(30)}
+    )
+    grouped = validation_scores.groupby("n_features_to_select")["score"]
+    expected = (2 * 1.96 * grouped.std() / np.sqrt(grouped.count())).max()
+
+    get_score_sums = BootstrappedRankAndValidate._get_score_sums
+    score_sums = get_score_sums(None, validation_scores[:12]).add(
+        get_score_sums(None, validation_scores[12:]), fill_value=0
+    )
+    ci_width = BootstrappedRankAndValidate._get_ci_width(None, score_sums)
+
+    assert np.isclose(ci_width, expected)
+
+
+@pytest.mark.parametrize("backend", ["sequential", "loky"])
+def test_memmap(cfg_mock_storage: PipelineConfig, tmp_path, backend: str):
+    """Memory-mapped datasets give the same scores as in-memory ones."""
+    cfg = cfg_mock_storage
+    cfg.dataset.cache_dir = str(tmp_path)
+    cfg.n_jobs = 2
+    cfg.backend = backend
+    columns = ["n_features_to_select", "score", "bootstrap_state"]
+    scores = run_pipeline___test_version(cfg.copy())
+
+    cfg.dataset.memmap = True
+    dataset = load_dataset___test_version(cfg)
+    assert isinstance(dataset.X, IndexedArray)
+    memmap_scores = run_pipeline___test_version(cfg)
+
+    pd.testing.assert_frame_equal(
+        scores["validation"][columns], memmap_scores["validation"][columns]
+    )
+
+
+@pytest.mark.parametrize("streaming", [False, True])
+def test_sparse(cfg_mock_storage: PipelineConfig, monkeypatch, streaming: bool):
+    """Sparse datasets are never densified: not by the CV split, resampling or
+    feature subset selection."""
+    cfg = cfg_mock_storage
+    cfg.streaming = streaming
+    cfg.dataset.adapter = {
+        "_target_": "tests.integration.pipelines.test_rank_and_validate."
+        + "SparseMockAdapter"
+    }
+    fit = RandomEstimator.fit
+
+    def sparse_fit(self, X, y):
+        assert sparse.issparse(X), "estimator was fit on a densified matrix."
+        return fit(self, X, y)
+
+    monkeypatch.setattr(RandomEstimator, "fit", sparse_fit)
+    scores = run_pipeline___test_version(cfg)
+
+    assert len(scores["validation"]) == cfg.n_bootstraps * 3
+    assert len(scores["support"]) == cfg.n_bootstraps
+
+
+@pytest.mark.parametrize("streaming", [False, True])
+def test_chunked(cfg_mock_storage: PipelineConfig, monkeypatch, streaming: bool):
+    """Chunked datasets are fit chunk by chunk: estimators never see all data."""
+    cfg = cfg_mock_storage
+    cfg.streaming = streaming
+    cfg.dataset.adapter = {
+        "_target_": "tests.integration.pipelines.test_rank_and_validate."
+        + "ChunkedMockAdapter"
+    }
+    partial_fit = RandomEstimator.partial_fit
+    chunk_sizes = []
+
+    def recording_partial_fit(self, X, y, classes=None):
+        assert isinstance(X, np.ndarray)
+        np.testing.assert_array_equal(classes, list(cfg.dataset.classes))
+        chunk_sizes.append(len(X))
+        return partial_fit(self, X, y, classes)
+
+    monkeypatch.setattr(RandomEstimator, "partial_fit", recording_partial_fit)
+    scores = run_pipeline___test_version(cfg)
+
+    assert cfg.dataset.chunked
+    assert len(scores["validation"]) == cfg.n_bootstraps * 3
+    assert len(scores["support"]) == cfg.n_bootstraps
+    assert chunk_sizes and max(chunk_sizes) <= 2
+
+
+def test_offload_fitted(cfg_mock_storage: PipelineConfig):
+    """Workers offload fitted estimators to disk, the main process restores them."""
+    cfg = cfg_mock_storage
+    columns = ["n_features_to_select", "score", "bootstrap_state"]
+
+    eager_scores = run_pipeline___test_version(cfg)
+    cfg.offload_fitted = True
+    cfg.n_jobs = 2
+    offloaded_scores = run_pipeline___test_version(cfg)
+
+    pd.testing.assert_frame_equal(
+        eager_scores["validation"][columns], offloaded_scores["validation"][columns]
+    )
+
+
+def test_offload_fitted_loads_ranker_once(
+    cfg_mock_storage: PipelineConfig, monkeypatch
+):
+    """An offloaded ranker is loaded once to score all validators of its bootstrap:
+    not once for every feature subset."""
+    cfg = cfg_mock_storage
+    cfg.offload_fitted = True
+    cfg.n_jobs = 2
+    cfg.all_features_to_select = "range(1, p + 1)"
+
+    loaded = []
+    restore_pickle = LocalStorage.restore_pickle
+
+    def counting_restore_pickle(self, filename: str):
+        loaded.append(filename)
+        return restore_pickle(self, filename)
+
+    monkeypatch.setattr(LocalStorage, "restore_pickle", counting_restore_pickle)
+    run_pipeline___test_version(cfg)
+
+    ranker_loads = [filename for filename in loaded if filename.startswith("ranking")]
+    assert len(ranker_loads) == cfg.n_bootstraps
+
+
+def test_memory_lean_requires_fit_score(cfg_mock_storage: PipelineConfig):
+    """Memory-lean pipelines cannot be scored after `fit`: they must `fit_score`."""
+    cfg = cfg_mock_storage
+    cfg.memory_lean = True
+    dataset = load_dataset___test_version(cfg)
+    pipeline = instantiate(cfg)
+    X_train, X_test, y_train, y_test = pipeline.cv.train_test_split(
+        dataset.X, dataset.y
+    )
+
+    with pytest.raises(ValueError, match="fit_score"):
+        pipeline.fit(X_train, y_train)
+
+    # a single bootstrap cannot be scored either
+    bootstrap = next(pipeline._get_estimator())
+    bootstrap.fit(X_train, y_train)
+    with pytest.raises(ValueError, match="fit_score"):
+        bootstrap.score(X_test, y_test)
+
+
+def test_memory_lean(cfg_mock_storage: PipelineConfig):
+    """Fitting and scoring every feature subset right away should yield the same
+    scores as the eager pipeline."""
+    cfg = cfg_mock_storage
+    columns = ["n_features_to_select", "score", "bootstrap_state"]
+
+    eager_scores = run_pipeline___test_version(cfg)
+    cfg.memory_lean = True
+    memory_lean_scores = run_pipeline___test_version(cfg)
+
+    pd.testing.assert_frame_equal(
+        eager_scores["validation"][columns], memory_lean_scores["validation"][columns]
+    )
+    assert len(memory_lean_scores["support"]) == cfg.n_bootstraps
+
+
+def test_streaming_does_not_materialize(cfg_mock_storage: PipelineConfig):
+    cfg = cfg_mock_storage
+    cfg.streaming = True
+    cfg.dataset.n = 4
+    cfg.dataset.p = 3
+    cfg.dataset.multioutput = False
+
+    pipeline = instantiate(cfg)
+    assert pipeline.estimators == []
+
+
 def test_validator_incompatibility_check(cfg: PipelineConfig):
     with pytest.raises(InstantiationException):
         cfg.dataset.n = 5
@@ -2,7 +2,11 @@ import pytest
 from omegaconf import DictConfig
 
 from fseval.config import PipelineConfig
-from fseval.utils.hydra_utils import get_config
+from fseval.utils.hydra_utils import (
+    get_config,
+    get_sweep_configs,
+    get_sweep_overrides,
+)
 
 
 @pytest.fixture
@@ -28,3 +32,53 @@ def test_config_loading(cfg) -> None:
 def test_config_attributes(cfg) -> None:
     assert cfg.dataset is not None
     assert cfg.cv is not None
+
+
+def test_get_sweep_overrides() -> None:
+    job_overrides = get_sweep_overrides(
+        "tests.integration.conf",
+        [
+            "dataset=synclf_easy",
+            "ranker=glob(anova_f_value_*)",
+            "validator=knn,decision_tree_classifier",
+            "cv.fold=range(0,2)",
+        ],
+    )
+
+    assert len(job_overrides) == 2 * 2 * 2
+    assert job_overrides[0] == [
+        "dataset=synclf_easy",
+        "ranker=anova_f_value_classifier",
+        "validator=knn",
+        "cv.fold=0",
+    ]
+    assert len(set(map(tuple, job_overrides))) == len(job_overrides)
+
+
+def test_get_sweep_overrides_verbatim() -> None:
+    """Overrides that are not sweeps, like deletions and force-adds, are kept as-is."""
+    overrides = [
+        "dataset=synclf_easy",
+        "ranker=chi2",
+        "validator=knn,decision_tree_classifier",
+        "~resample",
+        "++dataset.group=some_group",
+    ]
+    configs, job_overrides = get_sweep_configs(
+        "tests.integration.conf", "empty_config", overrides
+    )
+
+    assert job_overrides[1] == [
+        "dataset=synclf_easy",
+        "ranker=chi2",
+        "validator=decision_tree_classifier",
+        "~resample",
+        "++dataset.group=some_group",
+    ]
+    assert all("resample" not in config for config in configs)
+    assert all(config.dataset.group == "some_group" for config in configs)
+
+
+def test_get_sweep_overrides_unsupported() -> None:
+    with pytest.raises(ValueError):
+        get_sweep_overrides("tests.integration.conf", ["cv.fold=interval(0,1)"])
@@ -1,11 +1,14 @@
 import os
 import tempfile
+from glob import glob
 
 import pytest
 from hydra.conf import ConfigStore
 
 from fseval.config import EstimatorConfig, PipelineConfig
-from fseval.main import run_pipeline
+import fseval.main
+from fseval.main import _get_dataset_key, _run_sweep_job, run_pipeline, run_sweep
+from fseval.pipeline.dataset import DatasetLoader
 from fseval.utils.hydra_utils import get_config
 from hydra.conf import ConfigStore
 from hydra.errors import InstantiationException
@@ -137,3 +140,156 @@ def test_callbacks_multiprocessing(callbacks_multiprocessing_cfg: PipelineConfig
 
     # run pipeline
     run_pipeline(callbacks_multiprocessing_cfg)
+
+
+def test_run_pipeline_all_folds():
+    """Running all folds in one process should score every fold, tagged by fold."""
+    cfg = get_config(
+        config_module="tests.integration.conf",
+        config_name="empty_config",
+        overrides=[
+            "dataset=synclf_easy",
+            "ranker=anova_f_value_classifier",
+            "validator=decision_tree_classifier",
+            "storage=mock",
+            "cv=kfold",
+            "cv.splitter.n_splits=3",
+            "cv.all_folds=true",
+        ],
+    )
+
+    # execute from temporary dir
+    tmpdir = tempfile.mkdtemp()
+    os.chdir(tmpdir)
+
+    # run pipeline
+    scores = run_pipeline(cfg)
+
+    assert scores is not None
+    validation_scores = scores["validation"]
+    assert "fold" in validation_scores.columns
+    assert set(validation_scores["fold"]) == {0, 1, 2}
+
+
+@pytest.mark.parametrize("backend", ["sequential", "loky"])
+def test_run_sweep(backend: str):
+    """All jobs of a sweep should run, each in their own directory."""
+    sweep_dir = tempfile.mkdtemp()
+    results = run_sweep(
+        config_module="tests.integration.conf",
+        config_name="empty_config",
+        overrides=[
+            "dataset=synclf_easy",
+            "ranker=anova_f_value_classifier,decision_tree_classifier",
+            "validator=decision_tree_classifier",
+            "storage=mock",
+        ],
+        n_jobs=2,
+        backend=backend,
+        sweep_dir=sweep_dir,
+    )
+
+    assert len(results) == 2
+    for job_num, scores in enumerate(results):
+        assert scores is not None
+        assert "validation" in scores
+        job_dir = os.path.join(sweep_dir, str(job_num))
+        assert os.path.exists(os.path.join(job_dir, ".hydra", "config.yaml"))
+
+
+def test_run_sweep_shares_datasets(monkeypatch):
+    """Jobs run in the same process should load their dataset only once."""
+    monkeypatch.setattr("fseval.main._DATASETS", {})
+    load = DatasetLoader.load
+    calls = []
+
+    def counting_load(self):
+        calls.append(self.name)
+        return load(self)
+
+    monkeypatch.setattr(DatasetLoader, "load", counting_load)
+    run_sweep(
+        config_module="tests.integration.conf",
+        config_name="empty_config",
+        overrides=[
+            "dataset=synclf_easy",
+            "ranker=anova_f_value_classifier,decision_tree_classifier",
+            "validator=decision_tree_classifier",
+            "storage=mock",
+        ],
+        backend="sequential",
+        sweep_dir=tempfile.mkdtemp(),
+    )
+
+    assert len(calls) == 1
+
+
+def test_run_sweep_job_evicts_datasets(monkeypatch):
+    """Workers should keep only the dataset they loaded last."""
+    monkeypatch.setattr("fseval.main._DATASETS", {})
+    monkeypatch.setattr("fseval.main.run_pipeline", lambda cfg, **kwargs: None)
+
+    for dataset in ["synclf_easy", "synclf_medium", "synclf_easy"]:
+        cfg = get_config(
+            config_module="tests.integration.conf",
+            config_name="empty_config",
+            overrides=[f"dataset={dataset}", "ranker=chi2", "validator=knn"],
+        )
+        _run_sweep_job(cfg, tempfile.mkdtemp(), False)
+
+        assert list(fseval.main._DATASETS.keys()) == [_get_dataset_key(cfg)]
+
+
+def test_run_sweep_cache_dir():
+    """Jobs on the same dataset, fold and bootstrap should share their resamples."""
+    cache_dir = tempfile.mkdtemp()
+    results = run_sweep(
+        config_module="tests.integration.conf",
+        config_name="empty_config",
+        overrides=[
+            "dataset=synclf_easy",
+            "ranker=anova_f_value_classifier,decision_tree_classifier",
+            "validator=decision_tree_classifier",
+            "storage=mock",
+            "resample=bootstrap",
+            "n_bootstraps=2",
+        ],
+        backend="sequential",
+        sweep_dir=tempfile.mkdtemp(),
+        cache_dir=cache_dir,
+    )
+
+    assert all(scores is not None for scores in results)
+    # X and y for each of the 2 bootstraps. both jobs use the same resamples.
+    assert len(glob(os.path.join(cache_dir, "resample-*.npy"))) == 4
+    assert len(glob(os.path.join(cache_dir, "splits-*.npz"))) == 1
+
+
+def test_run_pipeline_fingerprints_lazily(monkeypatch):
+    """The dataset should only be fingerprinted when a cache or export uses it."""
+    calls = []
+    get_fingerprint = DatasetLoader.get_fingerprint
+
+    def counting_get_fingerprint(self, X, y):
+        calls.append(self.name)
+        return get_fingerprint(self, X, y)
+
+    monkeypatch.setattr(DatasetLoader, "get_fingerprint", counting_get_fingerprint)
+    os.chdir(tempfile.mkdtemp())
+    overrides = [
+        "dataset=synclf_easy",
+        "ranker=anova_f_value_classifier",
+        "validator=decision_tree_classifier",
+        "storage=mock",
+    ]
+
+    cfg = get_config("tests.integration.conf", "empty_config", overrides)
+    run_pipeline(cfg)
+    assert calls == []
+    assert cfg.dataset.fingerprint is None
+
+    cfg = get_config("tests.integration.conf", "empty_config", overrides)
+    cfg.cv.cache_dir = tempfile.mkdtemp()
+    run_pipeline(cfg)
+    assert len(calls) == 1
+    assert cfg.dataset.fingerprint is not None
@@ -32,6 +32,7 @@ class BaseCallbackTest(ABC):
                     "task": Task.classification,
                     "group": "some_group",
                     "domain": "some_domain",
+                    "fingerprint": "0123456789abcdef",
                 },
                 "ranker": {
                     "name": "some_ranker",
@@ -63,6 +64,7 @@ class BaseCallbackTest(ABC):
         assert "dataset" in df.columns
         assert "dataset/n" in df.columns
         assert "dataset/p" in df.columns
+        assert "dataset/fingerprint" in df.columns
 
         # assert types
         assert np.isscalar(df["dataset/n"][0])
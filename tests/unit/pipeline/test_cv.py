@@ -1,6 +1,6 @@
 import numpy as np
 import pytest
-from sklearn.model_selection import ShuffleSplit
+from sklearn.model_selection import KFold, ShuffleSplit
 
 from fseval.pipeline.cv import CrossValidator
 
@@ -28,3 +28,79 @@ def test_train_test_split(cv):
     train_index, test_index = cv.get_split(X)
     assert len(train_index) == 3
     assert len(test_index) == 3
+
+
+def test_get_split_fold(cv):
+    """Only the splits up to the current fold are generated."""
+    n_generated = 0
+
+    def split(X, y=None, groups=None):
+        nonlocal n_generated
+        for fold in range(5):
+            n_generated += 1
+            yield [fold], [fold]
+
+    cv.splitter = KFold(n_splits=5)
+    cv.splitter.split = split
+    cv.fold = 1
+    train_index, _ = cv.get_split(np.zeros((5, 1)))
+    assert train_index == [1]
+    assert n_generated == 2
+    assert cv.n_splits_ == 5
+
+
+def test_train_test_split_views(cv):
+    """Contiguous folds are views of the data, not copies."""
+    cv.splitter = KFold(n_splits=2)
+    X, y = np.arange(12).reshape(6, 2), np.arange(6)
+    X_train, X_test, _, y_test = cv.train_test_split(X, y)
+
+    assert np.shares_memory(X_train, X)
+    assert np.shares_memory(X_test, X)
+    assert np.shares_memory(y_test, y)
+    assert np.array_equal(X_test, X[:3])
+
+
+def test_split_cache(cv, tmp_path):
+    cv.splitter = KFold(n_splits=3, shuffle=True, random_state=0)
+    cv.cache_dir = str(tmp_path)
+    cv.dataset_fingerprint = "some_fingerprint"
+    X = np.zeros((9, 1))
+
+    # all splits are computed and cached once
+    splits = list(cv.split(X))
+    assert np.array_equal(cv.get_split(X)[1], splits[0][1])
+    assert len(list(tmp_path.glob("splits-*.npz"))) == 1
+
+    # other folds are restored from the cache
+    cv.fold = 2
+    cv.splitter.split = None
+    train_index, test_index = cv.get_split(X)
+    assert np.array_equal(train_index, splits[2][0])
+    assert np.array_equal(test_index, splits[2][1])
+
+    # a different dataset uses a different cache
+    cv.dataset_fingerprint = "other_fingerprint"
+    assert cv._get_cache_filename() not in map(str, tmp_path.glob("splits-*.npz"))
+
+    # shuffling without a fixed random state cannot be cached
+    cv.splitter = KFold(n_splits=3, shuffle=True)
+    assert cv._get_cache_filename() is None
+
+
+def test_get_split_key(cv):
+    cv.splitter = KFold(n_splits=3, shuffle=True, random_state=0)
+
+    # the split is only known given the dataset
+    assert cv.get_split_key() is None
+    cv.dataset_fingerprint = "some_fingerprint"
+    split_key = cv.get_split_key()
+    assert split_key is not None
+
+    # every fold has its own split
+    cv.fold = 1
+    assert cv.get_split_key() != split_key
+
+    # shuffling without a fixed random state gives different splits every time
+    cv.splitter = KFold(n_splits=3, shuffle=True)
+    assert cv.get_split_key() is None
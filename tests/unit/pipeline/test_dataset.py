@@ -4,9 +4,11 @@ from typing import Any
 import numpy as np
 import pytest
 from omegaconf import OmegaConf
+from scipy import sparse
 
 from fseval.pipeline.dataset import Dataset, DatasetLoader
 from fseval.types import AbstractAdapter, Task
+from fseval.utils.array_utils import IndexedArray
 
 
 @dataclass
@@ -50,7 +52,40 @@ def test_feature_importances(ds_loader):
     # instance-based feature importances are also supported
     ds_loader.feature_importances = {"X[0, :]": 1.0, "X[1, 0]": 3, "X[1, 1]": 1}
     ds: Dataset = ds_loader.load()
-    assert np.isclose(ds.feature_importances, [[0.5, 0.5], [0.75, 0.25]]).all()
+    assert sparse.issparse(ds.feature_importances)
+    assert np.isclose(
+        ds.feature_importances.toarray(), [[0.5, 0.5], [0.75, 0.25]]
+    ).all()
+
+
+def test_feature_importances_column_only(ds_loader):
+    """Column-only selectors never allocate an n x p matrix: only a p-vector."""
+    ds_loader.feature_importances = {"X[:, :]": 1.0, "X[:, 0:2]": "p"}
+    feature_importances = ds_loader.get_feature_importances(None, 10**9, 4)
+    assert np.isclose(feature_importances, [0.4, 0.4, 0.1, 0.1]).all()
+
+
+@pytest.mark.parametrize(
+    "selector,index",
+    [
+        ("X[:, 1]", (slice(None), 1)),
+        ("X[0, :]", (0, slice(None))),
+        ("X[0:2, 1]", (slice(0, 2), 1)),
+        ("X[..., p - 1]", (slice(None), 2)),
+        ("X[1]", (1, slice(None))),
+    ],
+)
+def test_parse_multi_axis_selectors(ds_loader, selector, index):
+    """Multi-axis subscripts parse into (rows, columns) indices, on every supported
+    python version: older versions parse them into `ExtSlice` and `Index` nodes."""
+    ds_loader.feature_importances = {selector: "1.0"}
+    assert ds_loader._parse_feature_importances(10, 3) == [(index, 1.0)]
+
+
+def test_feature_importances_unsafe(ds_loader):
+    ds_loader.feature_importances = {"X[().__class__]": 1.0}
+    with pytest.raises(ValueError):
+        ds_loader.load()
 
 
 def test_callable_adapter_assertion(ds_loader):
@@ -85,3 +120,66 @@ def test_callable_adapter(ds_loader):
     X, y = ds_loader._get_adapter_data()
     assert len(X) == 1
     assert len(y) == 1
+
+
+def test_dataset_cache(ds_loader, tmp_path, monkeypatch):
+    ds_loader.adapter = OmegaConf.create(
+        {"_target_": "tests.unit.pipeline.test_dataset.SomeAdapter"}
+    )
+    ds_loader.cache_dir = str(tmp_path)
+
+    # cache miss: adapter is called and the dataset is stored
+    ds: Dataset = ds_loader.load()
+    assert len(list(tmp_path.glob("*/X.npy"))) == 1
+
+    # cache hit: adapter is not called anymore
+    def get_data(self):
+        raise AssertionError("adapter should not be called on a cache hit.")
+
+    monkeypatch.setattr(SomeAdapter, "get_data", get_data)
+    cached: Dataset = ds_loader.load()
+    assert np.array_equal(cached.X, ds.X)
+    assert np.array_equal(cached.y, ds.y)
+
+    # a different adapter config is cached separately
+    cache_key = ds_loader._get_cache_key()
+    ds_loader.adapter_callable = "get_other_data"
+    assert ds_loader._get_cache_key() != cache_key
+
+
+def test_dataset_cache_object_adapter(ds_loader, tmp_path):
+    """Adapter objects cannot be hashed, so they are not cached."""
+    ds_loader.cache_dir = str(tmp_path)
+    ds_loader.load()
+    assert not any(tmp_path.iterdir())
+
+
+def test_dataset_memmap(ds_loader, tmp_path):
+    ds_loader.adapter = OmegaConf.create(
+        {"_target_": "tests.unit.pipeline.test_dataset.SomeAdapter"}
+    )
+    ds_loader.cache_dir = str(tmp_path)
+    ds_loader.memmap = True
+
+    # the data matrix is read from the memory-mapped cache, lazily
+    ds: Dataset = ds_loader.load()
+    assert isinstance(ds.X, IndexedArray)
+    assert isinstance(ds.X.array, np.memmap)
+    assert np.array_equal(np.asarray(ds.X[[1]]), [[2, 4]])
+
+
+def test_dataset_sparse(ds_loader, tmp_path):
+    ds_loader.adapter = lambda: (sparse.csc_matrix([[1, 0], [0, 4]]), [0, 1])
+
+    # sparse matrices are kept sparse, in CSR format
+    ds: Dataset = ds_loader.load()
+    assert sparse.isspmatrix_csr(ds.X)
+    assert ds.n == 2
+    assert ds.p == 2
+
+    # and are cached in the sparse format
+    X = ds_loader._get_data()[0]
+    ds_loader._save_cache(str(tmp_path), X, ds.y)
+    X_cached, _ = ds_loader._restore_cache(str(tmp_path))
+    assert sparse.issparse(X_cached)
+    assert np.array_equal(X_cached.toarray(), [[1, 0], [0, 4]])
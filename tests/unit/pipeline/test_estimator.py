@@ -1,6 +1,7 @@
 import tempfile
 from typing import cast
 
+import numpy as np
 import pytest
 from hydra.utils import instantiate
 from hydra.errors import InstantiationException
@@ -11,6 +12,7 @@ from fseval.config import EstimatorConfig
 from fseval.pipeline.estimator import Estimator
 from fseval.storage.local import LocalStorage
 from fseval.types import CacheUsage, Task
+from fseval.utils.array_utils import ChunkedArray
 
 
 @pytest.fixture
@@ -99,6 +101,56 @@ def test_incompatibility(estimator_cfg: EstimatorConfig):
     with pytest.raises(InstantiationException):
         instantiate(estimator_cfg)
 
+    # chunked dataset, but estimator has no `partial_fit`
+    estimator_cfg.multioutput_only = False
+    estimator_cfg.is_chunked_dataset = True
+    with pytest.raises(InstantiationException):
+        instantiate(estimator_cfg)
+
+
+def test_partial_fit_classes(estimator_cfg: EstimatorConfig):
+    """Chunked datasets are fit using all classes of the dataset, even when the
+    bootstrap misses a class."""
+    estimator_cfg.estimator = {"_target_": "sklearn.linear_model.SGDClassifier"}
+    estimator_cfg.is_chunked_dataset = True
+    estimator_cfg.dataset_classes = [0, 1, 2]
+    estimator = instantiate(estimator_cfg)
+
+    X = np.arange(12, dtype=float).reshape(6, 2)
+    y = np.array([0, 0, 1, 1, 2, 2])
+    chunked = ChunkedArray(lambda: iter([(X[:3], y[:3]), (X[3:], y[3:])]), 6, 2)
+
+    # bootstrap without class 2
+    estimator.fit(chunked[[0, 1, 2, 3]], y[[0, 1, 2, 3]])
+    np.testing.assert_array_equal(estimator.estimator.classes_, [0, 1, 2])
+
+
+def test_offloaded_estimator_is_loaded_lazily(estimator_cfg: EstimatorConfig):
+    """Offloaded estimators are loaded only whilst used: saving, scoring and reading
+    their attributes keeps them offloaded."""
+    estimator: Estimator = instantiate(estimator_cfg)
+    tmpdir: str = tempfile.mkdtemp()
+    storage: LocalStorage = LocalStorage(load_dir=tmpdir, save_dir=tmpdir)
+
+    X, y = [[1, 2], [3, 4]], [0, 1]
+    estimator.fit(X, y)
+    fit_time = estimator.fit_time_
+    feature_importances = estimator.feature_importances_
+    score = estimator.score(X, y)
+    estimator._offload("offloaded.pickle", storage)
+
+    estimator._save_cache("fit_estimator.pickle", storage)
+    assert estimator.score(X, y) == score
+    np.testing.assert_array_equal(estimator.feature_importances_, feature_importances)
+    assert estimator.fit_time_ == fit_time
+    assert estimator.estimator is None
+    assert estimator._offloaded is not None
+
+    # the saved cache contains the fitted estimator
+    new_estimator: Estimator = instantiate(estimator_cfg)
+    new_estimator._load_cache("fit_estimator.pickle", storage)
+    assert new_estimator.score(X, y) == score
+
 
 class FakeFeatureRanker(BaseEstimator):
     def fit(self, X, y):
@@ -31,3 +31,56 @@ def test_sample_size(X):
     resampler = Resample(random_state=0, sample_size=1.0)
     X_shuffled = resampler.transform(X)
     assert len(X_shuffled) == 10
+
+
+def test_resample_cache(tmp_path):
+    X = np.arange(20).reshape(10, 2)
+    y = np.arange(10)
+
+    # first run computes the resample, and stores it
+    resampler = Resample(random_state=1, replace=True, cache_dir=str(tmp_path))
+    resampler.split_key = "some-split-fold=0"
+    X_resampled, y_resampled = resampler.transform(X, y)
+    assert len(list(tmp_path.glob("resample-*.npy"))) == 2
+    assert isinstance(X_resampled, np.memmap)
+
+    # other runs on the same split and bootstrap attach to the stored resample
+    resampler = Resample(random_state=1, replace=True, cache_dir=str(tmp_path))
+    resampler.split_key = "some-split-fold=0"
+    X_restored, y_restored = resampler.transform(X, y)
+    np.testing.assert_array_equal(X_restored, X_resampled)
+    np.testing.assert_array_equal(y_restored, y_resampled)
+    X_expected, _ = Resample(random_state=1, replace=True).transform(X, y)
+    np.testing.assert_array_equal(X_restored, X_expected)
+
+    # copy-on-write: modifying the resample does not change the stored one
+    X_restored[0] = -1
+    X_restored, _ = resampler.transform(X, y)
+    np.testing.assert_array_equal(X_restored, X_resampled)
+
+    # another fold is stored separately
+    resampler.split_key = "some-split-fold=1"
+    resampler.transform(X, y)
+    assert len(list(tmp_path.glob("resample-*.npy"))) == 4
+
+
+def test_resample_cache_disabled(tmp_path):
+    X = np.arange(20).reshape(10, 2)
+
+    # split is unknown
+    resampler = Resample(random_state=1, cache_dir=str(tmp_path))
+    resampler.transform(X)
+    # resample is random
+    resampler = Resample(random_state=None, cache_dir=str(tmp_path))
+    resampler.split_key = "some-split-fold=0"
+    resampler.transform(X)
+
+    # string labels cannot be memory-mapped
+    y = np.array(["a", "b"] * 5, dtype=object)
+    resampler = Resample(random_state=1, cache_dir=str(tmp_path))
+    resampler.split_key = "some-split-fold=0"
+    _, y_resampled = resampler.transform(X, y)
+    _, y_resampled_again = resampler.transform(X, y)
+    np.testing.assert_array_equal(y_resampled, y_resampled_again)
+
+    assert len(list(tmp_path.glob("resample-*.npy"))) == 0
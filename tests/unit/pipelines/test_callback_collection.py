@@ -1,10 +1,16 @@
+import pickle
 from dataclasses import dataclass
+from threading import Thread
+from time import sleep
 from typing import Dict, Optional
 
 import pandas as pd
 from omegaconf import DictConfig, OmegaConf
 
-from fseval.pipelines._callback_collection import CallbackCollection
+from fseval.pipelines._callback_collection import (
+    CallbackCollection,
+    CallbackRecorder,
+)
 from fseval.types import Callback
 
 
@@ -59,3 +65,58 @@ def test_callback_iteration():
     assert some_callback.ran_on_table == True
     assert some_callback.ran_on_summary == True
     assert some_callback.ran_on_end == True
+
+
+def test_callback_recorder():
+    """Recorded callback calls should be replayed onto the actual callbacks."""
+    recorder: CallbackRecorder = CallbackRecorder()
+    recorder.on_table(pd.DataFrame(), "some_table")
+    recorder.on_metrics({})
+    assert len(recorder.calls) == 2
+
+    some_callback: SomeCallback = SomeCallback()
+    CallbackRecorder.replay(recorder.calls, some_callback)
+    assert some_callback.ran_on_table == True
+    assert some_callback.ran_on_metrics == True
+    assert some_callback.ran_on_begin == False
+
+
+@dataclass
+class ConcurrencyCheckingCallback(Callback):
+    n_active: int = 0
+    max_active: int = 0
+
+    def on_table(self, df: pd.DataFrame, name: str):
+        self.n_active += 1
+        self.max_active = max(self.max_active, self.n_active)
+        sleep(0.001)
+        self.n_active -= 1
+
+
+def test_callback_thread_safety():
+    """Callbacks must never be called concurrently from multiple threads."""
+    callback: ConcurrencyCheckingCallback = ConcurrencyCheckingCallback()
+    callback_collection: CallbackCollection = CallbackCollection(callback=callback)
+
+    def log_tables():
+        for _ in range(10):
+            callback_collection.on_table(pd.DataFrame(), "some_table")
+
+    threads = [Thread(target=log_tables) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert callback.max_active == 1
+
+
+def test_callback_collection_pickling():
+    """The lock is recreated after unpickling, e.g. when sent to another process."""
+    callback_collection: CallbackCollection = CallbackCollection(
+        some_callback=SomeCallback()
+    )
+    unpickled = pickle.loads(pickle.dumps(callback_collection))
+
+    unpickled.on_table(pd.DataFrame(), "")
+    assert unpickled.some_callback.ran_on_table == True
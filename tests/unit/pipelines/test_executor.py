@@ -0,0 +1,77 @@
+import multiprocessing
+
+import numpy as np
+import pytest
+
+from fseval.pipelines._executor import BACKENDS, Executor
+
+
+def multiply(a, b):
+    return a * b
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_starmap(backend: str):
+    """Results are returned in order, regardless of the backend."""
+    if backend == "dask":
+        pytest.importorskip("distributed")
+    if backend == "ray":
+        pytest.importorskip("ray")
+
+    executor = Executor(backend=backend, n_jobs=2)
+    results = executor.starmap(multiply, ((i, 2) for i in range(10)))
+
+    assert results == [i * 2 for i in range(10)]
+
+
+def test_inner_threads():
+    executor = Executor(n_jobs=-1)
+    assert executor.cpus == multiprocessing.cpu_count()
+    assert executor.inner_threads == 1
+
+    executor = Executor(n_jobs=1)
+    assert executor.inner_threads == multiprocessing.cpu_count()
+
+
+def test_unknown_backend():
+    with pytest.raises(AssertionError):
+        Executor(backend="some_backend")
+
+
+def test_put_shared():
+    """Arrays shared by all tasks are put in the object store only once."""
+    X = np.zeros((10, 3))
+    executor = Executor(backend="dask", n_jobs=2)
+
+    put_calls = []
+
+    def put(arg):
+        put_calls.append(arg)
+        return "reference"
+
+    tasks = list(executor._put_shared(put, ((X, i) for i in range(5))))
+
+    assert len(put_calls) == 1
+    assert tasks == [("reference", i) for i in range(5)]
+
+
+def test_cost_aware():
+    """Most expensive tasks are dispatched first; results are returned in order."""
+    executor = Executor(backend="sequential", n_jobs=1, scheduler="cost_aware")
+    dispatched = []
+
+    def record(a):
+        dispatched.append(a)
+        return a
+
+    costs = [1.0, 3.0, 2.0, 5.0]
+    results = executor.starmap(record, ((i,) for i in range(4)), costs=costs)
+
+    assert dispatched == [3, 1, 2, 0]
+    assert results == [0, 1, 2, 3]
+    assert executor.makespan_ >= 0
+
+
+def test_unknown_scheduler():
+    with pytest.raises(AssertionError):
+        Executor(scheduler="some_scheduler")
@@ -0,0 +1,68 @@
+import pandas as pd
+import pytest
+
+from fseval.pipelines._experiment import Experiment
+
+
+@pytest.fixture
+def experiment() -> Experiment:
+    return Experiment()
+
+
+def test_aggregate_dataframes(experiment: Experiment):
+    scores = [pd.DataFrame([{"score": i}]) for i in range(3)]
+    aggregated = experiment._aggregate_scores(scores)
+
+    assert isinstance(aggregated, pd.DataFrame)
+    assert list(aggregated["score"]) == [0, 1, 2]
+
+
+def test_aggregate_dicts(experiment: Experiment):
+    """Common keys are aggregated, uncommon keys are kept as-is."""
+    scores = [
+        {"validation": pd.DataFrame([{"score": 0}]), "support": pd.DataFrame()},
+        {"validation": pd.DataFrame([{"score": 1}])},
+    ]
+    aggregated = experiment._aggregate_scores(scores)
+
+    assert set(aggregated.keys()) == {"validation", "support"}
+    assert len(aggregated["validation"]) == 2
+    assert aggregated["support"].empty
+
+
+def test_aggregate_incompatible(experiment: Experiment):
+    with pytest.raises(ValueError):
+        experiment._aggregate_scores([pd.DataFrame(), {}])
+
+
+def test_aggregate_benchmark(experiment: Experiment, monkeypatch):
+    """Regression benchmark: aggregating 100 bootstraps x 200 subsets. Each level of
+    the experiment tree must concatenate its DataFrames exactly once."""
+    n_bootstraps, n_subsets = 100, 200
+
+    # count concatenations
+    n_concat_calls = 0
+    concat = pd.concat
+
+    def counting_concat(*args, **kwargs):
+        nonlocal n_concat_calls
+        n_concat_calls += 1
+        return concat(*args, **kwargs)
+
+    monkeypatch.setattr(pd, "concat", counting_concat)
+
+    # aggregate subsets per bootstrap, then aggregate all bootstraps
+    bootstraps = []
+    for bootstrap_state in range(n_bootstraps):
+        subsets = [
+            pd.DataFrame([{"n_features_to_select": i, "score": 0.5}])
+            for i in range(n_subsets)
+        ]
+        validation = experiment._aggregate_scores(subsets)
+        ranking = pd.DataFrame([{"bootstrap_state": bootstrap_state}])
+        bootstraps.append({"ranking": ranking, "validation": validation})
+    scores = experiment._aggregate_scores(bootstraps)
+
+    assert len(scores["validation"]) == n_bootstraps * n_subsets
+    assert len(scores["ranking"]) == n_bootstraps
+    assert n_concat_calls == n_bootstraps + 2
@@ -0,0 +1,56 @@
+import subprocess
+import sys
+from typing import Dict
+
+import pytest
+
+# modules that reference heavy optional dependencies, but should not import them.
+FSEVAL_MODULES = [
+    "fseval.main",
+    "fseval.callbacks.to_wandb",
+    "fseval.callbacks.to_sql",
+    "fseval.storage.wandb",
+    "fseval.adapters.openml",
+    "fseval.adapters.wandb",
+]
+HEAVY_MODULES = ["wandb", "sqlalchemy", "openml"]
+
+
+def import_times(*modules: str) -> Dict[str, int]:
+    """Imports modules in a fresh interpreter, using `python -X importtime`. Returns
+    the cumulative import time of every imported module, in microseconds."""
+    statement = "; ".join(f"import {module}" for module in modules)
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    times: Dict[str, int] = {}
+    for line in process.stderr.splitlines():
+        # lines are formatted as: `import time: self [us] | cumulative | name`
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        times[name.strip()] = int(cumulative)
+
+    return times
+
+
+def test_import_time():
+    times = import_times(*FSEVAL_MODULES)
+
+    for module in FSEVAL_MODULES:
+        assert module in times, f"{module} was not imported."
+    for module in HEAVY_MODULES:
+        assert module not in times, f"{module} is imported at import time of fseval."
+
+
+@pytest.mark.parametrize("module", HEAVY_MODULES)
+def test_import_on_use(module: str):
+    """Sanity check: the heavy modules are detected once they are imported."""
+    pytest.importorskip(module)
+    times = import_times(module)
+
+    assert module in times
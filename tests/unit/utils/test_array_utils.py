@@ -0,0 +1,85 @@
+import pickle
+
+import numpy as np
+import pytest
+from sklearn.model_selection import KFold
+from sklearn.utils import resample
+
+from fseval.utils.array_utils import ChunkedArray, IndexedArray
+
+
+@pytest.fixture
+def X(tmp_path) -> np.ndarray:
+    X = np.arange(60, dtype=float).reshape(12, 5)
+    np.save(tmp_path / "X.npy", X)
+    return X
+
+
+@pytest.fixture
+def view(X, tmp_path) -> IndexedArray:
+    return IndexedArray(np.load(tmp_path / "X.npy", mmap_mode="r"))
+
+
+def test_indexing(X, view):
+    rows = view[[0, 3, 3, 7]]
+    assert isinstance(rows, IndexedArray)
+    assert rows.shape == (4, 5)
+    assert np.array_equal(np.asarray(rows), X[[0, 3, 3, 7]])
+
+    # indices compose: views of views select from the original array
+    columns = rows[1:, np.array([True, False, True, False, False])]
+    assert isinstance(columns, IndexedArray)
+    assert np.array_equal(np.asarray(columns), X[[3, 3, 7]][:, [0, 2]])
+    assert np.array_equal(columns[..., 1], X[[3, 3, 7], 2])
+
+    # scalar indices are read immediately
+    assert np.array_equal(columns[0], X[3, [0, 2]])
+    assert columns[0, 1] == X[3, 2]
+
+
+def test_sklearn_splits(X, view):
+    y = np.arange(12)
+    train_index, _ = next(KFold(n_splits=3).split(view))
+    X_train, y_train = resample(view[train_index], y[train_index], random_state=0)
+    X_expected, y_expected = resample(X[train_index], y[train_index], random_state=0)
+
+    assert isinstance(X_train, IndexedArray)
+    assert np.array_equal(np.asarray(X_train), X_expected)
+    assert np.array_equal(y_train, y_expected)
+
+
+def test_pickle(X, view):
+    """Pickling a view of a memory-map does not pickle the data itself."""
+    rows = view[[1, 2]]
+    pickled = pickle.dumps(rows)
+    assert len(pickled) < X.nbytes
+
+    restored = pickle.loads(pickled)
+    assert isinstance(restored.array, np.memmap)
+    assert np.array_equal(np.asarray(restored), X[[1, 2]])
+
+
+def test_chunked(X):
+    y = np.arange(12)
+
+    def get_chunks():
+        for i in range(0, 12, 5):
+            yield X[i : i + 5], y[i : i + 5]
+
+    chunked = ChunkedArray(get_chunks, 12, 5)
+    assert chunked.shape == (12, 5)
+    with pytest.raises(TypeError):
+        np.asarray(chunked)
+
+    # rows are selected by multiplicity, and streamed in their original order
+    rows = np.array([7, 0, 7, 11])
+    view = chunked[rows][1:, [0, 4]]
+    assert view.shape == (3, 2)
+
+    # chunks without selected rows are skipped
+    chunks = list(view.iter_chunks())
+    assert len(chunks) == 2
+    X_view = np.concatenate([X_chunk for X_chunk, _ in chunks])
+    y_view = np.concatenate([y_chunk for _, y_chunk in chunks])
+    assert np.array_equal(X_view, X[[7, 7, 11]][:, [0, 4]])
+    assert np.array_equal(y_view, [7, 7, 11])
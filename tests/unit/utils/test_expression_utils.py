@@ -0,0 +1,71 @@
+import pytest
+
+from fseval.utils.expression_utils import (
+    evaluate_expression,
+    evaluate_subset_grid,
+    geomspace,
+    linspace,
+)
+
+
+def test_evaluate_subset_grid():
+    assert evaluate_subset_grid("range(1, min(50, p) + 1)", 100, 3) == (1, 2, 3)
+    assert evaluate_subset_grid("[3, 1, 2, 2.0]", 100, 3) == (3, 1, 2, 2)
+    assert evaluate_subset_grid("[int(f * p) for f in (0.1, 0.5, 1)]", 100, 10) == (
+        1,
+        5,
+        10,
+    )
+
+
+def test_evaluate_subset_grid_not_integral():
+    with pytest.raises(ValueError, match="integers"):
+        evaluate_subset_grid("[1.5, 2]", 100, 3)
+
+
+def test_evaluate_subset_grid_cached():
+    evaluate_subset_grid.cache_clear()
+    evaluate_subset_grid("range(1, p + 1)", 10, 100_000)
+    evaluate_subset_grid("range(1, p + 1)", 10, 100_000)
+
+    assert evaluate_subset_grid.cache_info().hits == 1
+
+
+def test_grids():
+    assert linspace(1, 10, 4) == [1, 4, 7, 10]
+    grid = geomspace(1, 100_000, 50)
+    assert grid[0] == 1 and grid[-1] == 100_000
+    assert grid == sorted(set(grid))
+
+
+@pytest.mark.parametrize(
+    "expression,expected",
+    [
+        ("range(1, min(50, p) + 1)", range(1, 11)),
+        ("1.0", 1.0),
+        ("-2", -2),
+        ("'abc'[1]", "b"),
+        ("[True, None]", [True, None]),
+        ("list(range(p))[1:3]", [1, 2]),
+        ("[[1, 2], [3, 4]][1][0]", 3),
+    ],
+)
+def test_literals_and_subscripts(expression: str, expected: object):
+    """Numbers, strings and subscripts are allowed: also on python versions where
+    `ast.parse` still produces the legacy `Num`, `Str` and `Index` node types."""
+    assert evaluate_expression(expression, n=10, p=10) == expected
+
+
+@pytest.mark.parametrize(
+    "expression",
+    [
+        "__import__('os')",
+        "().__class__.__bases__",
+        "open('/etc/passwd')",
+        "[x for x in range(p)] if exec else []",
+        "lambda: 1",
+    ],
+)
+def test_unsafe_expressions(expression: str):
+    with pytest.raises(ValueError):
+        evaluate_expression(expression, n=10, p=10)
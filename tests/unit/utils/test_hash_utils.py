@@ -0,0 +1,43 @@
+import numpy as np
+from scipy import sparse
+
+from fseval.utils.array_utils import IndexedArray
+from fseval.utils.hash_utils import BLOCK_SIZE, fingerprint
+
+
+def test_fingerprint():
+    X = np.random.RandomState(0).rand(100, 10)
+
+    # stable, and independent of memory layout
+    assert fingerprint(X) == fingerprint(X.copy())
+    assert fingerprint(X) == fingerprint(np.asfortranarray(X))
+
+    # sensitive to values, shape and dtype
+    X_changed = X.copy()
+    X_changed[50, 5] += 1
+    assert fingerprint(X) != fingerprint(X_changed)
+    assert fingerprint(X) != fingerprint(X.reshape(10, 100))
+    assert fingerprint(X) != fingerprint(X.astype(np.float32))
+
+
+def test_fingerprint_sampled():
+    """Only the sampled blocks are hashed."""
+    X = np.zeros((4 * BLOCK_SIZE // 8, 1))
+    X_changed = X.copy()
+    X_changed[BLOCK_SIZE // 8 + 1] = 1.0
+
+    assert fingerprint(X) != fingerprint(X_changed)
+    assert fingerprint(X, max_blocks=2) == fingerprint(X_changed, max_blocks=2)
+    assert fingerprint(X, max_blocks=2) != fingerprint(X)
+
+
+def test_fingerprint_formats(tmp_path):
+    X = np.eye(5)
+    y = np.array(["a", "b", "a", "b", "a"], dtype=object)
+    np.save(tmp_path / "X.npy", X)
+    X_memmap = np.load(tmp_path / "X.npy", mmap_mode="r")
+
+    assert fingerprint(X, y) == fingerprint(X_memmap, y)
+    assert fingerprint(X) == fingerprint(IndexedArray(X_memmap))
+    assert fingerprint(sparse.csr_matrix(X)) == fingerprint(sparse.csc_matrix(X))
+    assert fingerprint(sparse.csr_matrix(X)) != fingerprint(X)
@@ -0,0 +1,61 @@
+from omegaconf import OmegaConf
+
+from fseval.utils.resource_utils import (
+    coordinate_n_jobs,
+    effective_n_jobs,
+    get_estimator_threads,
+    plan_resources,
+)
+
+
+def test_effective_n_jobs():
+    assert effective_n_jobs(None, 8) == 1
+    assert effective_n_jobs(1, 8) == 1
+    assert effective_n_jobs(-1, 8) == 8
+    assert effective_n_jobs(-2, 8) == 7
+    assert effective_n_jobs(16, 8) == 8
+
+
+def test_get_estimator_threads():
+    assert get_estimator_threads(None, 8) == 1
+    assert get_estimator_threads({"_target_": "some.Estimator"}, 8) == 1
+    assert get_estimator_threads({"n_jobs": -1}, 8) == 8
+    assert get_estimator_threads({"nthread": 2, "n_jobs": None}, 8) == 2
+
+
+def test_plan_resources():
+    assert plan_resources(-1, 100, 8, 8) == (8, 1)
+    assert plan_resources(2, 100, 8, 8) == (2, 4)
+    # never more workers than bootstraps
+    assert plan_resources(-1, 2, 8, 8) == (2, 4)
+
+
+def test_coordinate_n_jobs():
+    cfg = OmegaConf.create(
+        {
+            "n_jobs": -1,
+            "n_bootstraps": 4,
+            "ranker": {"estimator": {"_target_": "some.Ranker", "n_jobs": -1}},
+            "validator": {"estimator": {"_target_": "some.Validator"}},
+        }
+    )
+    coordinate_n_jobs(cfg, cpu_count=8)
+
+    assert cfg.n_jobs == 4
+    assert cfg.ranker.estimator.n_jobs == 2
+    assert "n_jobs" not in cfg.validator.estimator
+
+
+def test_coordinate_n_jobs_no_oversubscription():
+    """Configs that do not oversubscribe are left untouched."""
+    cfg = OmegaConf.create(
+        {
+            "n_jobs": 1,
+            "n_bootstraps": 4,
+            "ranker": {"estimator": {"_target_": "some.Ranker", "n_jobs": -1}},
+        }
+    )
+    coordinate_n_jobs(cfg, cpu_count=8)
+
+    assert cfg.n_jobs == 1
+    assert cfg.ranker.estimator.n_jobs == -1